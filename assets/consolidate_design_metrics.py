@@ -21,16 +21,143 @@ across multiple metrics.
 
 import argparse
 import csv
-import json
+import fnmatch
 import glob
+import json
 import os
 import sys
-from pathlib import Path
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from operator import attrgetter
+import pickle
 import re
 import numpy as np
 
+try:
+    # orjson is considerably faster on float-heavy score files; fall back to
+    # the stdlib parser when it is not installed in the container.
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """
+    Decode JSON with orjson when available, falling back to the stdlib parser.
+    
+    orjson rejects the NaN/Infinity tokens that json.loads accepts, so
+    documents it cannot decode are retried with json.loads.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+# Read buffer for the line-oriented parsers: 64 KiB covers most metric files
+# in a single read() call
+READ_BUFFER_SIZE = 1 << 16
+
+# Write buffer for the summary CSV, so the rows formatted by the csv module
+# reach the file in a few large write() calls
+WRITE_BUFFER_SIZE = 1 << 20
 
+# Cache of parsed metric files. Entries are keyed by (cache format version,
+# parser name, absolute path, mtime in ns, size), so a file shared by several
+# models is parsed once per run, and with --cache_file only re-parsed when it
+# changes between consolidation runs.
+#
+# Bump PARSE_CACHE_VERSION whenever a parser's output changes: cache files
+# written with another version are discarded as a whole.
+PARSE_CACHE_VERSION = 1
+_cached_parse_results = None  # results loaded from the cache file (None if disabled)
+_used_parse_results = {}  # results used in this run (saved back to the cache file)
+
+
+def load_parse_cache(cache_file):
+    """
+    Enable the persistent parse cache and load previous results from cache_file.
+    
+    The cache is a pickle file, and unpickling can execute arbitrary code:
+    only point --cache_file at a file written by this script in a trusted
+    location. A cache written with a different PARSE_CACHE_VERSION is
+    ignored.
+    
+    Returns:
+        number of cached entries loaded
+    """
+    global _cached_parse_results
+    _cached_parse_results = {}
+    
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                cache = pickle.load(f)
+            if isinstance(cache, dict) and cache.get('version') == PARSE_CACHE_VERSION:
+                _cached_parse_results = cache['entries']
+            else:
+                print(f"Warning: Ignoring parse cache {cache_file} written by another version", file=sys.stderr)
+        except Exception as e:
+            print(f"Warning: Could not load parse cache {cache_file}: {e}", file=sys.stderr)
+    
+    return len(_cached_parse_results)
+
+
+def save_parse_cache(cache_file):
+    """
+    Write the results used in this run to cache_file.
+    
+    Only entries for files seen in this run are kept, so stale entries
+    for changed or deleted files are dropped.
+    """
+    if _cached_parse_results is None:
+        return
+    
+    try:
+        tmp_file = f"{cache_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(
+                {'version': PARSE_CACHE_VERSION, 'entries': _used_parse_results},
+                f, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_file, cache_file)
+    except Exception as e:
+        print(f"Warning: Could not write parse cache {cache_file}: {e}", file=sys.stderr)
+
+
+def cached_parser(parse_fn):
+    """
+    Decorator memoizing a parser's result for the run, and serving it from
+    the persistent cache when enabled.
+    
+    The parser must take a single file path and return a metrics dict.
+    """
+    @wraps(parse_fn)
+    def wrapper(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return parse_fn(path)
+        
+        key = (PARSE_CACHE_VERSION, parse_fn.__name__, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        result = _used_parse_results.get(key)
+        if result is None and _cached_parse_results is not None:
+            result = _cached_parse_results.get(key)
+        if result is None:
+            result = parse_fn(path)
+        _used_parse_results[key] = result
+        
+        # Return a copy so callers cannot modify cached entries
+        return dict(result)
+    
+    return wrapper
+
+
+@cached_parser
 def parse_ipsae_scores(ipsae_file):
     """
     Parse IPSAE score file.
@@ -43,22 +170,41 @@ def parse_ipsae_scores(ipsae_file):
     """
     metrics = {'ipsae_score': None}
     
-    if not os.path.exists(ipsae_file):
-        return metrics
-    
     try:
-        with open(ipsae_file, 'r') as f:
-            for line in f:
-                if line.startswith('IPSAE:'):
-                    score = float(line.split(':')[1].strip())
-                    metrics['ipsae_score'] = score
-                    break
+        # The file is tiny: read it in one go and locate the first line
+        # starting with 'IPSAE:' with a single bytes scan
+        with open(ipsae_file, 'rb') as f:
+            data = f.read()
+        
+        if data.startswith(b'IPSAE:'):
+            start = 0
+        else:
+            start = data.find(b'\nIPSAE:')
+            if start >= 0:
+                start += 1
+        
+        if start >= 0:
+            end = data.find(b'\n', start)
+            line = data[start:end] if end >= 0 else data[start:]
+            metrics['ipsae_score'] = float(line.split(b':')[1].strip())
+    except FileNotFoundError:
+        return metrics
     except Exception as e:
         print(f"Warning: Could not parse IPSAE file {ipsae_file}: {e}", file=sys.stderr)
     
     return metrics
 
 
+# (metric name, PRODIGY summary column, converter)
+PRODIGY_COLUMNS = (
+    ('buried_surface_area', 'buried_surface_area_A2', float),
+    ('num_interface_contacts', 'num_interface_contacts', int),
+    ('predicted_binding_affinity', 'predicted_binding_affinity_kcal_mol', float),
+    ('predicted_kd', 'predicted_kd_M', float),
+)
+
+
+@cached_parser
 def parse_prodigy_csv(prodigy_csv):
     """
     Parse PRODIGY CSV output.
@@ -73,24 +219,28 @@ def parse_prodigy_csv(prodigy_csv):
         'predicted_kd': None
     }
     
-    if not os.path.exists(prodigy_csv):
-        return metrics
-    
     try:
-        with open(prodigy_csv, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                metrics['buried_surface_area'] = float(row['buried_surface_area_A2']) if row.get('buried_surface_area_A2') else None
-                metrics['num_interface_contacts'] = int(row['num_interface_contacts']) if row.get('num_interface_contacts') else None
-                metrics['predicted_binding_affinity'] = float(row['predicted_binding_affinity_kcal_mol']) if row.get('predicted_binding_affinity_kcal_mol') else None
-                metrics['predicted_kd'] = float(row['predicted_kd_M']) if row.get('predicted_kd_M') else None
-                break  # Only first row
+        # The summary is a header plus a single row: resolve the column
+        # indices from the header once and index the first row directly
+        with open(prodigy_csv, 'r', newline='', buffering=READ_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            row = next(reader, None)  # Only first row
+        
+        if row:
+            for key, column, convert in PRODIGY_COLUMNS:
+                i = header.index(column) if column in header else None
+                value = row[i] if i is not None and i < len(row) else None
+                metrics[key] = convert(value) if value else None
+    except FileNotFoundError:
+        return metrics
     except Exception as e:
         print(f"Warning: Could not parse PRODIGY CSV {prodigy_csv}: {e}", file=sys.stderr)
     
     return metrics
 
 
+@cached_parser
 def parse_foldseek_summary(foldseek_tsv):
     """
     Parse Foldseek summary TSV output.
@@ -105,25 +255,36 @@ def parse_foldseek_summary(foldseek_tsv):
         'foldseek_num_hits': 0
     }
     
-    if not os.path.exists(foldseek_tsv):
-        return metrics
-    
     try:
-        with open(foldseek_tsv, 'r') as f:
+        with open(foldseek_tsv, 'rb', buffering=READ_BUFFER_SIZE) as f:
             # Skip header line
-            next(f)
+            f.readline()
             hit_count = 0
-            for line in f:
-                hit_count += 1
-                # First data line is the top hit
-                if hit_count == 1:
-                    fields = line.strip().split('\t')
-                    if len(fields) >= 12:
-                        metrics['foldseek_top_hit'] = fields[1]  # target name
-                        metrics['foldseek_top_evalue'] = float(fields[10])  # evalue
-                        metrics['foldseek_top_bits'] = float(fields[11])  # bits
+            
+            # First data line is the top hit
+            line = f.readline()
+            if line:
+                hit_count = 1
+                # Split the raw bytes and only decode the target name;
+                # float() accepts bytes directly
+                fields = line.strip().split(b'\t')
+                if len(fields) >= 12:
+                    metrics['foldseek_top_hit'] = fields[1].decode()  # target name
+                    metrics['foldseek_top_evalue'] = float(fields[10])  # evalue
+                    metrics['foldseek_top_bits'] = float(fields[11])  # bits
+                
+                # Count the remaining hits by scanning 1 MiB blocks for newlines
+                # rather than iterating line by line
+                last = b'\n'
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    hit_count += block.count(b'\n')
+                    last = block[-1:]
+                if last != b'\n':
+                    hit_count += 1  # final line without a trailing newline
             
             metrics['foldseek_num_hits'] = hit_count
+    except FileNotFoundError:
+        return metrics
     except Exception as e:
         print(f"Warning: Could not parse Foldseek TSV {foldseek_tsv}: {e}", file=sys.stderr)
     
@@ -148,20 +309,20 @@ def parse_boltzgen_predictions(predictions_dir):
     if not os.path.exists(predictions_dir):
         return metrics
     
-    # Look for JSON files with scores
-    json_files = glob.glob(os.path.join(predictions_dir, '*.json'))
-    for json_file in json_files:
+    # Look for JSON files with scores; metrics found in later files replace
+    # earlier ones
+    for json_file in glob.iglob(os.path.join(predictions_dir, '*.json')):
         try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
+            with open(json_file, 'rb') as f:
+                data = json_loads(f.read())
                 
                 # Try to extract common confidence metrics
-                if 'model_confidence' in data:
-                    metrics['model_confidence'] = float(data['model_confidence'])
-                if 'plddt' in data:
-                    metrics['plddt_avg'] = float(data['plddt'])
-                if 'ptm' in data:
-                    metrics['ptm_score'] = float(data['ptm'])
+                if (value := data.get('model_confidence')) is not None:
+                    metrics['model_confidence'] = float(value)
+                if (value := data.get('plddt')) is not None:
+                    metrics['plddt_avg'] = float(value)
+                if (value := data.get('ptm')) is not None:
+                    metrics['ptm_score'] = float(value)
                     
         except Exception as e:
             print(f"Warning: Could not parse JSON file {json_file}: {e}", file=sys.stderr)
@@ -169,6 +330,32 @@ def parse_boltzgen_predictions(predictions_dir):
     return metrics
 
 
+# Characters a numeric CSV cell can start with, plus the spelled-out
+# non-finite values float() accepts
+FLOAT_LEADING_CHARS = frozenset('0123456789+-.')
+FLOAT_SPECIAL_VALUES = frozenset(('nan', 'inf', 'infinity'))
+
+
+def _maybe_float(value):
+    """
+    Convert a CSV cell to float if it is numeric, otherwise return it unchanged.
+    
+    Cells that cannot be numbers (IDs, sequences, empty cells) are rejected
+    by a cheap first-character test instead of a raised ValueError.
+    """
+    if not isinstance(value, str):
+        return value
+    
+    text = value.strip()
+    if text[:1] in FLOAT_LEADING_CHARS or text.lower().lstrip('+-') in FLOAT_SPECIAL_VALUES:
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    return value
+
+
+@cached_parser
 def parse_aggregate_metrics_csv(csv_file):
     """
     Parse Boltzgen aggregate_metrics_analyze.csv file.
@@ -178,29 +365,32 @@ def parse_aggregate_metrics_csv(csv_file):
     """
     metrics = {}
     
-    if not os.path.exists(csv_file):
-        return metrics
-    
     try:
-        with open(csv_file, 'r') as f:
+        with open(csv_file, 'r', buffering=READ_BUFFER_SIZE) as f:
             reader = csv.DictReader(f)
             # Read first row (assuming single design or aggregate stats)
             for row in reader:
-                # Extract any numeric columns
+                # Extract any numeric columns (non-numeric values are kept as strings)
                 for key, value in row.items():
-                    try:
-                        # Try to convert to float
-                        metrics[f'aggregate_{key}'] = float(value)
-                    except (ValueError, TypeError):
-                        # Keep as string if not numeric
-                        metrics[f'aggregate_{key}'] = value
+                    metrics[f'aggregate_{key}'] = _maybe_float(value)
                 break  # Only first row
+    except FileNotFoundError:
+        return metrics
     except Exception as e:
         print(f"Warning: Could not parse aggregate metrics CSV {csv_file}: {e}", file=sys.stderr)
     
     return metrics
 
 
+def _is_float(value):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+@cached_parser
 def parse_per_target_metrics_csv(csv_file):
     """
     Parse Boltzgen per_target_metrics_analyze.csv file.
@@ -210,40 +400,51 @@ def parse_per_target_metrics_csv(csv_file):
     """
     metrics = {}
     
-    if not os.path.exists(csv_file):
-        return metrics
-    
     try:
-        with open(csv_file, 'r') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            
-            if not rows:
+        with open(csv_file, 'r', buffering=READ_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
                 return metrics
             
-            # If multiple rows, calculate averages for numeric columns
-            numeric_cols = defaultdict(list)
-            
-            for row in rows:
-                for key, value in row.items():
-                    try:
-                        numeric_cols[key].append(float(value))
-                    except (ValueError, TypeError):
-                        pass
+            # Gather the cells column by column
+            columns = [[] for _ in header]
+            for row in reader:
+                for column, value in zip(columns, row):
+                    column.append(value)
+        
+        # If multiple rows, calculate averages for numeric columns. Whole
+        # columns are converted by NumPy in one call; only columns holding
+        # non-numeric cells fall back to converting cell by cell.
+        for key, column in zip(header, columns):
+            if not column:
+                continue
+            try:
+                values = np.array(column, dtype=np.float64)
+            except ValueError:
+                values = np.array([v for v in column if _is_float(v)], dtype=np.float64)
             
-            # Calculate averages
-            for key, values in numeric_cols.items():
-                if values:
-                    metrics[f'per_target_{key}_avg'] = sum(values) / len(values)
-                    metrics[f'per_target_{key}_min'] = min(values)
-                    metrics[f'per_target_{key}_max'] = max(values)
+            if values.size:
+                # Sequential sum rather than np.mean (pairwise summation), so
+                # the averages match the original output to the last bit
+                metrics[f'per_target_{key}_avg'] = sum(values.tolist()) / values.size
+                metrics[f'per_target_{key}_min'] = float(values.min())
+                metrics[f'per_target_{key}_max'] = float(values.max())
                     
+    except FileNotFoundError:
+        return metrics
     except Exception as e:
         print(f"Warning: Could not parse per-target metrics CSV {csv_file}: {e}", file=sys.stderr)
     
     return metrics
 
 
+# score / global_score / seq_recovery fields of ProteinMPNN FASTA headers.
+# \b keeps 'score=' from matching inside 'global_score='.
+MPNN_HEADER_FIELD = re.compile(r'\b(score|global_score|seq_recovery)=\s*([^,\s]+)')
+
+
+@cached_parser
 def parse_proteinmpnn_scores(mpnn_scores_fa):
     """
     Parse ProteinMPNN score files from FASTA format.
@@ -261,31 +462,24 @@ def parse_proteinmpnn_scores(mpnn_scores_fa):
         'mpnn_num_sequences': 0
     }
     
-    if not os.path.exists(mpnn_scores_fa):
-        return metrics
-    
     try:
-        scores = []
-        global_scores = []
-        seq_recoveries = []
+        # Only the '>' header lines contain 'name=value' fields, so scan the
+        # whole file with one findall instead of looping over its lines
+        # Example header: >T=0.1, sample=1, score=2.1234, global_score=2.5678, seq_recovery=0.85
+        with open(mpnn_scores_fa, 'r', buffering=READ_BUFFER_SIZE) as f:
+            pairs = MPNN_HEADER_FIELD.findall(f.read())
         
-        with open(mpnn_scores_fa, 'r') as f:
-            for line in f:
-                if line.startswith('>'):
-                    # Parse header
-                    # Example: >T=0.1, sample=1, score=2.1234, global_score=2.5678, seq_recovery=0.85
-                    parts = line[1:].strip().split(',')
-                    for part in parts:
-                        if 'score=' in part and 'global_score' not in part:
-                            score = float(part.split('=')[1].strip())
-                            scores.append(score)
-                        elif 'global_score=' in part:
-                            global_score = float(part.split('=')[1].strip())
-                            global_scores.append(global_score)
-                        elif 'seq_recovery=' in part:
-                            seq_recovery = float(part.split('=')[1].strip())
-                            seq_recoveries.append(seq_recovery)
+        # Split the values by field name; they are averaged in plain Python
+        # below, so there is no need for a round trip through NumPy arrays
+        fields = {'score': [], 'global_score': [], 'seq_recovery': []}
+        for name, value in pairs:
+            fields[name].append(float(value))
+        scores = fields['score']
+        global_scores = fields['global_score']
+        seq_recoveries = fields['seq_recovery']
         
+        # Average with a sequential sum, not np.mean (pairwise summation),
+        # so the means match the original output to the last bit
         if scores:
             metrics['mpnn_score'] = sum(scores) / len(scores)
             metrics['mpnn_num_sequences'] = len(scores)
@@ -296,12 +490,15 @@ def parse_proteinmpnn_scores(mpnn_scores_fa):
         if seq_recoveries:
             metrics['mpnn_seq_recovery'] = sum(seq_recoveries) / len(seq_recoveries)
             
+    except FileNotFoundError:
+        return metrics
     except Exception as e:
         print(f"Warning: Could not parse ProteinMPNN scores from {mpnn_scores_fa}: {e}", file=sys.stderr)
     
     return metrics
 
 
+@cached_parser
 def parse_protenix_confidence(confidence_json):
     """
     Parse Protenix confidence JSON output.
@@ -318,41 +515,42 @@ def parse_protenix_confidence(confidence_json):
         'protenix_ranking_score': None
     }
     
-    if not os.path.exists(confidence_json):
-        return metrics
-    
     try:
-        with open(confidence_json, 'r') as f:
-            data = json.load(f)
+        # Read the whole file and decode it in one call
+        with open(confidence_json, 'rb') as f:
+            data = json_loads(f.read())
         
         # Extract pLDDT (average per-residue confidence)
-        if 'plddt' in data:
-            plddt_values = data['plddt']
+        if (plddt_values := data.get('plddt')) is not None:
             if isinstance(plddt_values, list):
-                metrics['protenix_plddt'] = sum(plddt_values) / len(plddt_values)
+                if plddt_values:
+                    metrics['protenix_plddt'] = sum(plddt_values) / len(plddt_values)
             else:
                 metrics['protenix_plddt'] = float(plddt_values)
         
         # Extract pTM (predicted TM-score)
-        if 'ptm' in data:
-            metrics['protenix_ptm'] = float(data['ptm'])
+        if (ptm := data.get('ptm')) is not None:
+            metrics['protenix_ptm'] = float(ptm)
         
         # Extract ipTM (interface predicted TM-score)
-        if 'iptm' in data:
-            metrics['protenix_iptm'] = float(data['iptm'])
+        if (iptm := data.get('iptm')) is not None:
+            metrics['protenix_iptm'] = float(iptm)
         
         # Extract ranking score (if available)
-        if 'ranking_score' in data:
-            metrics['protenix_ranking_score'] = float(data['ranking_score'])
-        elif 'score' in data:
-            metrics['protenix_ranking_score'] = float(data['score'])
+        if (ranking_score := data.get('ranking_score')) is not None:
+            metrics['protenix_ranking_score'] = float(ranking_score)
+        elif (score := data.get('score')) is not None:
+            metrics['protenix_ranking_score'] = float(score)
             
+    except FileNotFoundError:
+        return metrics
     except Exception as e:
         print(f"Warning: Could not parse Protenix confidence JSON {confidence_json}: {e}", file=sys.stderr)
     
     return metrics
 
 
+@lru_cache(maxsize=8192)
 def extract_design_id_from_path(file_path):
     """
     Extract design ID from file path.
@@ -361,25 +559,231 @@ def extract_design_id_from_path(file_path):
     - design_name_model_0.cif
     - design_name.cif
     - /path/to/design_name_output/...
+    
+    The mapping is pure, so results are memoized per path.
     """
     basename = os.path.basename(file_path)
     
     # Remove extensions
-    name = basename.replace('.cif', '').replace('.pdb', '')
+    name = basename[:-4] if basename.endswith(('.cif', '.pdb')) else basename
     
-    # Remove common suffixes
-    name = re.sub(r'_model_\d+$', '', name)
-    name = re.sub(r'_output$', '', name)
-    name = re.sub(r'_input$', '', name)
+    # Remove common suffixes (_model_<N>, _output, _input) with plain
+    # string operations rather than regular expressions
+    idx = name.rfind('_model_')
+    if idx >= 0 and name[idx + 7:].isdigit():
+        name = name[:idx]
+    name = name.removesuffix('_output').removesuffix('_input')
     
     return name
 
 
+# Upper bound on concurrent file parses. Parsing is dominated by blocking
+# open()/read() calls on many small files, so threads overlap well.
+MAX_PARSE_WORKERS = 32
+
+
+def parse_files_concurrently(parse_fn, paths):
+    """
+    Apply a parser to many files using a thread pool.
+    
+    Args:
+        parse_fn: callable taking a single path and returning a metrics dict
+        paths: list of file paths to parse
+    
+    Returns:
+        list of parse_fn results, in the same order as paths
+    """
+    if not paths:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(paths))) as executor:
+        return list(executor.map(parse_fn, paths))
+
+
+def _split_glob_pattern(pattern):
+    """Split a '*/dir/file' style glob into (parent directory glob, file name glob)."""
+    parts = pattern.split('/')
+    return (parts[-2] if len(parts) > 1 else '*'), parts[-1]
+
+
+def _iter_tree(path, depth=0, ancestors=frozenset()):
+    """
+    Recursively yield (depth, directory path, DirEntry) for every file below path.
+    
+    DirEntry objects cache the file type from the directory read, so no extra
+    stat calls are needed to tell files from directories. Hidden directories
+    are skipped, as glob does. Symlinked directories are followed, but a
+    directory already on the current path (identified by st_dev and st_ino)
+    is not entered again, so symlink cycles cannot recurse forever.
+    """
+    try:
+        st = os.stat(path)
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    dir_key = (st.st_dev, st.st_ino)
+    if dir_key in ancestors:
+        return
+    ancestors = ancestors | {dir_key}
+    
+    for entry in entries:
+        if entry.is_dir():
+            if not entry.name.startswith('.'):
+                yield from _iter_tree(entry.path, depth + 1, ancestors)
+        elif entry.is_file():
+            yield depth, path, entry
+
+
+def collect_metric_files(output_dir, ipsae_pattern, prodigy_pattern, foldseek_pattern):
+    """
+    Scan the output directory once and classify the files each step needs.
+    
+    A single recursive os.scandir pass replaces one directory listing per
+    collection step plus the per-file existence checks. The IPSAE, PRODIGY
+    and Foldseek glob patterns are matched on their last two components
+    (parent directory name and file name) at any depth below output_dir.
+    
+    Args:
+        output_dir: Path to the Nextflow output directory
+        ipsae_pattern: Glob pattern to find IPSAE score files
+        prodigy_pattern: Glob pattern to find PRODIGY CSV files
+        foldseek_pattern: Glob pattern to find Foldseek TSV files
+    
+    Returns:
+        dict mapping category -> list of file paths, for the categories
+        'aggregate', 'per_target', 'inverse_folded', 'mpnn_scores',
+        'protenix_confidence', 'ipsae', 'prodigy' and 'foldseek'
+    """
+    # (category, parent directory glob, file name glob, required depth or None)
+    rules = [
+        ('aggregate', '*', 'aggregate_metrics_analyze.csv', 1),
+        ('per_target', '*', 'per_target_metrics_analyze.csv', 1),
+        ('inverse_folded', 'intermediate_designs_inverse_folded', '*.cif', None),
+        ('mpnn_scores', '*_mpnn_optimized', '*_scores.fa', 1),
+        ('protenix_confidence', 'protenix', '*_confidence.json', 2),
+        ('ipsae',) + _split_glob_pattern(ipsae_pattern) + (None,),
+        ('prodigy',) + _split_glob_pattern(prodigy_pattern) + (None,),
+        ('foldseek',) + _split_glob_pattern(foldseek_pattern) + (None,),
+    ]
+    collected = {rule[0]: [] for rule in rules}
+    
+    # Files of one directory are yielded together, so the rules that apply
+    # to a directory are only worked out once
+    current_dir = None
+    active_rules = []
+    for depth, dir_path, entry in _iter_tree(output_dir):
+        if dir_path != current_dir:
+            current_dir = dir_path
+            parent = os.path.basename(dir_path)
+            active_rules = [
+                (category, file_glob) for category, dir_glob, file_glob, rule_depth in rules
+                if (rule_depth is None or rule_depth == depth) and fnmatch.fnmatch(parent, dir_glob)
+            ]
+        
+        for category, file_glob in active_rules:
+            if fnmatch.fnmatch(entry.name, file_glob):
+                collected[category].append(entry.path)
+                break
+    
+    return collected
+
+
+def _stem_minus(path, suffix=''):
+    """
+    File name of path without its extension and without a trailing suffix.
+    
+    Plain string operations, equivalent to Path(path).stem minus suffix,
+    without building a Path object per file.
+    """
+    name = os.path.basename(path)
+    dot = name.rfind('.')
+    stem = name[:dot] if dot > 0 else name
+    return stem[:-len(suffix)] if suffix and stem.endswith(suffix) else stem
+
+
+def _grandparent_name(path):
+    # Name of the directory two levels above path
+    return os.path.basename(os.path.dirname(os.path.dirname(path)))
+
+
+def _mpnn_model_key(scores_fa):
+    # Pattern: {output_dir}/{design_id}_mpnn_optimized/{model_id}_scores.fa
+    design_id = os.path.basename(os.path.dirname(scores_fa)).removesuffix('_mpnn_optimized')
+    return design_id, _stem_minus(scores_fa, '_scores')
+
+
+# Protenix run directory name: {design_id}_mpnn_{seq_num}
+PROTENIX_DESIGN_DIR = re.compile(r'(.+)_mpnn_\d+$')
+
+
+def _protenix_model_key(confidence_json):
+    # Pattern: {output_dir}/{design_id}_mpnn_{seq_num}/protenix/{model_id}_confidence.json
+    # Stored under the Protenix sequence name: {design_id}_mpnn_{seq_num}_{model_id}
+    protenix_name = _grandparent_name(confidence_json)
+    match = PROTENIX_DESIGN_DIR.match(protenix_name)
+    if not match:
+        return None
+    return match.group(1), protenix_name + '_' + _stem_minus(confidence_json, '_confidence')
+
+
+def _ipsae_model_key(ipsae_file):
+    # Pattern: {output_dir}/{design_id}/ipsae_scores/{model_id}_{pae}_{dist}.txt
+    return _grandparent_name(ipsae_file), _stem_minus(ipsae_file).rsplit('_', 2)[0]  # Remove _10_10 suffix
+
+
+def _prodigy_model_key(prodigy_file):
+    # Pattern: {output_dir}/{design_id}/prodigy/{model_id}_prodigy_summary.csv
+    return _grandparent_name(prodigy_file), _stem_minus(prodigy_file, '_prodigy_summary')
+
+
+def _foldseek_model_key(foldseek_file):
+    # Pattern: {output_dir}/{design_id}/foldseek/{model_id}_foldseek_summary.tsv
+    return _grandparent_name(foldseek_file), _stem_minus(foldseek_file, '_foldseek_summary')
+
+
+# Per-model metric sources:
+# (collect_metric_files category, label, parser, path -> (design_id, model_id))
+MODEL_METRIC_SOURCES = [
+    ('mpnn_scores', 'ProteinMPNN score', parse_proteinmpnn_scores, _mpnn_model_key),
+    ('protenix_confidence', 'Protenix confidence', parse_protenix_confidence, _protenix_model_key),
+    ('ipsae', 'IPSAE score', parse_ipsae_scores, _ipsae_model_key),
+    ('prodigy', 'PRODIGY summary', parse_prodigy_csv, _prodigy_model_key),
+    ('foldseek', 'Foldseek summary', parse_foldseek_summary, _foldseek_model_key),
+]
+
+MODEL_METRIC_PARSERS = {category: parse_fn for category, _, parse_fn, _ in MODEL_METRIC_SOURCES}
+
+
+def _parse_design_files(files):
+    """
+    Parse the per-model metric files of one design in a worker process.
+    
+    Args:
+        files: list of (collect_metric_files category, path) tuples
+    
+    Returns:
+        tuple (metrics dicts in the order of files, parse cache entries
+        created by this worker, to be merged into the parent's cache)
+    """
+    results = [MODEL_METRIC_PARSERS[category](path) for category, path in files]
+    used = dict(_used_parse_results)
+    _used_parse_results.clear()
+    return results, used
+
+
+def _quiet(*args, **kwargs):
+    """Stand-in for print() when verbose output is disabled."""
+
+
 def aggregate_metrics_from_directories(
     output_dir,
     ipsae_pattern='*/ipsae_scores/*_10_10.txt',
     prodigy_pattern='*/prodigy/*_prodigy_summary.csv',
-    foldseek_pattern='*/foldseek/*_foldseek_summary.tsv'
+    foldseek_pattern='*/foldseek/*_foldseek_summary.tsv',
+    verbose=False,
+    processes=1
 ):
     """
     Aggregate metrics from a Nextflow output directory structure.
@@ -404,254 +808,166 @@ def aggregate_metrics_from_directories(
         ipsae_pattern: Glob pattern to find IPSAE score files
         prodigy_pattern: Glob pattern to find PRODIGY CSV files
         foldseek_pattern: Glob pattern to find Foldseek TSV files
+        verbose: Print per-step diagnostic output
+        processes: Number of worker processes for per-model parsing; with
+            more than one, each design's files are parsed in a separate
+            process, otherwise a thread pool is used
     
     Returns:
         dict mapping design_id -> metrics
     """
     all_metrics = defaultdict(lambda: defaultdict(dict))
     
+    # Diagnostic output is only emitted in verbose mode
+    log = print if verbose else _quiet
+    
     # Debug: Show what we're working with
-    print(f"\n{'='*80}")
-    print(f"CONSOLIDATING METRICS FROM: {output_dir}")
-    print(f"{'='*80}")
-    print(f"Directory exists: {os.path.exists(output_dir)}")
-    if os.path.exists(output_dir):
-        print(f"\nTop-level directory contents:")
+    log(f"\n{'='*80}")
+    log(f"CONSOLIDATING METRICS FROM: {output_dir}")
+    log(f"{'='*80}")
+    log(f"Directory exists: {os.path.exists(output_dir)}")
+    if verbose and os.path.exists(output_dir):
+        log(f"\nTop-level directory contents:")
         try:
-            for item in sorted(os.listdir(output_dir)):
-                item_path = os.path.join(output_dir, item)
-                if os.path.isdir(item_path):
-                    print(f"  [DIR]  {item}")
+            with os.scandir(output_dir) as it:
+                entries = sorted(it, key=attrgetter('name'))
+            for entry in entries:
+                if entry.is_dir():
+                    log(f"  [DIR]  {entry.name}")
                 else:
-                    print(f"  [FILE] {item}")
+                    log(f"  [FILE] {entry.name}")
         except Exception as e:
-            print(f"Error listing directory: {e}")
-    print(f"{'='*80}\n")
+            log(f"Error listing directory: {e}")
+    log(f"{'='*80}\n")
+    
+    # Find every metrics file in a single traversal of the output directory
+    collected = collect_metric_files(output_dir, ipsae_pattern, prodigy_pattern, foldseek_pattern)
     
     # ============================================================================
     # STEP 1: Collect Boltzgen design information and base metrics
     # ============================================================================
-    print(f"\n{'─'*80}")
-    print("STEP 1: Collecting Boltzgen design metrics")
-    print(f"{'─'*80}")
-    
-    # Find all Boltzgen output directories (pattern: {design_id}/ with aggregate/per_target CSVs)
-    design_dirs = []
-    if os.path.exists(output_dir):
-        for item in os.listdir(output_dir):
-            item_path = os.path.join(output_dir, item)
-            if os.path.isdir(item_path) and not item.startswith('.'):
-                # Check if this looks like a Boltzgen output directory
-                aggregate_csv = os.path.join(item_path, 'aggregate_metrics_analyze.csv')
-                if os.path.exists(aggregate_csv):
-                    design_dirs.append((item, item_path))
-    
-    print(f"Found {len(design_dirs)} Boltzgen design directories")
-    
-    for design_id, design_path in design_dirs:
-        print(f"\n  Processing design: {design_id}")
+    log(f"\n{'─'*80}")
+    log("STEP 1: Collecting Boltzgen design metrics")
+    log(f"{'─'*80}")
+    step_start = time.perf_counter()
+    
+    # Boltzgen output directories (pattern: {design_id}/ with aggregate/per_target CSVs)
+    per_target_csvs = {os.path.dirname(path): path for path in collected['per_target']}
+    aggregate_csvs = {os.path.dirname(path): path for path in collected['aggregate']}
+    design_dirs = [(os.path.basename(design_path), design_path) for design_path in aggregate_csvs]
+    
+    log(f"Found {len(design_dirs)} Boltzgen design directories")
+    
+    # Group budget design structures by their Boltzgen design directory
+    inverse_folded_by_design = defaultdict(list)
+    for cif_file in collected['inverse_folded']:
+        inverse_folded_by_design[os.path.dirname(os.path.dirname(cif_file))].append(cif_file)
+    
+    def parse_design_csvs(design_path):
+        # Parse aggregate metrics CSV (overall design quality) and
+        # per-target metrics CSV (target-specific metrics), using the paths
+        # found by the directory scan
+        boltz_metrics = parse_aggregate_metrics_csv(aggregate_csvs[design_path])
+        per_target_csv = per_target_csvs.get(design_path)
+        target_metrics = parse_per_target_metrics_csv(per_target_csv) if per_target_csv else None
+        return boltz_metrics, target_metrics
+    
+    design_csv_metrics = parse_files_concurrently(
+        parse_design_csvs, [design_path for _, design_path in design_dirs]
+    )
+    
+    for (design_id, design_path), (boltz_metrics, target_metrics) in zip(design_dirs, design_csv_metrics):
+        log(f"\n  Processing design: {design_id}")
         
-        # Parse aggregate metrics CSV (overall design quality)
-        aggregate_csv = os.path.join(design_path, 'aggregate_metrics_analyze.csv')
-        if os.path.exists(aggregate_csv):
-            boltz_metrics = parse_aggregate_metrics_csv(aggregate_csv)
-            print(f"    ✓ Aggregate metrics: {len(boltz_metrics)} fields")
+        if boltz_metrics is not None:
+            log(f"    ✓ Aggregate metrics: {len(boltz_metrics)} fields")
             
             # Store these as base Boltzgen metrics
             for key, value in boltz_metrics.items():
                 all_metrics[design_id]['boltzgen'][key] = value
         
-        # Parse per-target metrics CSV (target-specific metrics)
-        per_target_csv = os.path.join(design_path, 'per_target_metrics_analyze.csv')
-        if os.path.exists(per_target_csv):
-            target_metrics = parse_per_target_metrics_csv(per_target_csv)
-            print(f"    ✓ Per-target metrics: {len(target_metrics)} fields")
+        if target_metrics is not None:
+            log(f"    ✓ Per-target metrics: {len(target_metrics)} fields")
             
             for key, value in target_metrics.items():
                 all_metrics[design_id]['boltzgen'][key] = value
         
         # Find all intermediate design CIF files from intermediate_designs_inverse_folded
         # These are the budget designs that go through IPSAE/PRODIGY/Foldseek
-        inverse_folded_dir = os.path.join(design_path, 'intermediate_designs_inverse_folded')
-        if os.path.exists(inverse_folded_dir):
-            cif_files = glob.glob(os.path.join(inverse_folded_dir, '*.cif'))
-            print(f"    ✓ Found {len(cif_files)} budget design structures")
+        if design_path in inverse_folded_by_design:
+            cif_files = inverse_folded_by_design[design_path]
+            log(f"    ✓ Found {len(cif_files)} budget design structures")
             
             # Store model IDs for this design
             model_ids = []
             for cif_file in cif_files:
-                model_id = Path(cif_file).stem
+                model_id = _stem_minus(cif_file)
                 model_ids.append(model_id)
             
             all_metrics[design_id]['_model_ids'] = model_ids
     
-    # ============================================================================
-    # STEP 2: Collect ProteinMPNN sequence optimization metrics
-    # ============================================================================
-    print(f"\n{'─'*80}")
-    print("STEP 2: Collecting ProteinMPNN sequence optimization metrics")
-    print(f"{'─'*80}")
-    
-    # Find ProteinMPNN optimized directories (pattern: {design_id}_mpnn_optimized/)
-    mpnn_dirs = glob.glob(os.path.join(output_dir, '*_mpnn_optimized'))
-    print(f"Found {len(mpnn_dirs)} ProteinMPNN output directories")
-    
-    for mpnn_dir in mpnn_dirs:
-        # Extract design ID (remove _mpnn_optimized suffix)
-        mpnn_parent = Path(mpnn_dir).name.replace('_mpnn_optimized', '')
-        print(f"\n  Processing MPNN outputs for: {mpnn_parent}")
-        
-        # Find all _scores.fa files
-        scores_files = glob.glob(os.path.join(mpnn_dir, '*_scores.fa'))
-        print(f"    Found {len(scores_files)} score files")
-        
-        for scores_fa in scores_files:
-            model_id = Path(scores_fa).stem.replace('_scores', '')
-            mpnn_metrics = parse_proteinmpnn_scores(scores_fa)
-            
-            if mpnn_metrics['mpnn_score'] is not None:
-                print(f"    ✓ {model_id}: score={mpnn_metrics['mpnn_score']:.3f}")
-            
-            # Store under the model ID
-            for key, value in mpnn_metrics.items():
-                all_metrics[mpnn_parent][model_id][key] = value
+    print(f"Step 1: parsed {len(design_dirs)} Boltzgen design directories in {time.perf_counter() - step_start:.2f}s")
     
     # ============================================================================
-    # STEP 3: Collect Protenix refolding metrics
+    # STEP 2: Collect per-model metrics (ProteinMPNN, Protenix, IPSAE, PRODIGY, Foldseek)
     # ============================================================================
-    print(f"\n{'─'*80}")
-    print("STEP 3: Collecting Protenix refolding metrics")
-    print(f"{'─'*80}")
-    
-    # Find Protenix output directories (pattern: {design_id}_mpnn_{seq_num}/)
-    protenix_dirs = glob.glob(os.path.join(output_dir, '*_mpnn_*'))
-    # Filter out _mpnn_optimized directories
-    protenix_dirs = [d for d in protenix_dirs if not d.endswith('_mpnn_optimized')]
-    print(f"Found {len(protenix_dirs)} Protenix output directories")
-    
-    for protenix_dir in protenix_dirs:
-        protenix_name = Path(protenix_dir).name
-        # Extract parent design ID (pattern: {design_id}_mpnn_{seq_num})
-        match = re.match(r'(.+)_mpnn_\d+$', protenix_name)
-        if not match:
-            continue
+    log(f"\n{'─'*80}")
+    log("STEP 2: Collecting per-model metrics")
+    log(f"{'─'*80}")
+    step_start = time.perf_counter()
+    
+    # Build one task list across all per-model sources
+    model_tasks = []
+    for category, label, _, model_key_fn in MODEL_METRIC_SOURCES:
+        files = collected[category]
+        log(f"Found {len(files)} {label} files")
         
-        parent_design = match.group(1)
-        print(f"\n  Processing Protenix outputs for: {protenix_name}")
+        for path in files:
+            model_key = model_key_fn(path)
+            if model_key is not None:
+                model_tasks.append((model_key, category, path))
+    
+    # Create each model's entry in task order first, so the output order does
+    # not depend on which file finishes parsing first
+    for (design_id, model_id), _, _ in model_tasks:
+        all_metrics[design_id].setdefault(model_id, {})
+    
+    # Merge results in submission order, so repeated runs produce identical
+    # output regardless of which file finishes parsing first
+    if model_tasks and processes > 1:
+        # Fan out per design: each design's files are parsed together in one
+        # worker process, side-stepping the GIL for CPU-bound parsing
+        tasks_by_design = defaultdict(list)
+        for task in model_tasks:
+            tasks_by_design[task[0][0]].append(task)
         
-        # Find confidence JSON files in protenix/ subdirectory
-        confidence_dir = os.path.join(protenix_dir, 'protenix')
-        if os.path.exists(confidence_dir):
-            json_files = glob.glob(os.path.join(confidence_dir, '*_confidence.json'))
-            print(f"    Found {len(json_files)} confidence files")
-            
-            for json_file in json_files:
-                model_id = Path(json_file).stem.replace('_confidence', '')
-                protenix_metrics = parse_protenix_confidence(json_file)
-                
-                if protenix_metrics['protenix_plddt'] is not None:
-                    print(f"    ✓ {model_id}: pLDDT={protenix_metrics['protenix_plddt']:.2f}")
-                
-                # Store under the Protenix sequence name
-                for key, value in protenix_metrics.items():
-                    all_metrics[parent_design][protenix_name + '_' + model_id][key] = value
-    
-    # ============================================================================
-    # STEP 4: Collect IPSAE interface quality scores
-    # ============================================================================
-    print(f"\n{'─'*80}")
-    print("STEP 4: Collecting IPSAE interface quality scores")
-    print(f"{'─'*80}")
-    
-    ipsae_search_path = os.path.join(output_dir, ipsae_pattern)
-    ipsae_files = glob.glob(ipsae_search_path, recursive=True)
-    print(f"Found {len(ipsae_files)} IPSAE score files")
-    
-    for ipsae_file in ipsae_files:
-        # Extract design ID and model ID from path
-        # Pattern: {output_dir}/{design_id}/ipsae_scores/{model_id}_{pae}_{dist}.txt
-        path_parts = Path(ipsae_file).parts
-        if 'ipsae_scores' in path_parts:
-            idx = path_parts.index('ipsae_scores')
-            if idx > 0:
-                design_id = path_parts[idx - 1]
-                model_id = Path(ipsae_file).stem.rsplit('_', 2)[0]  # Remove _10_10 suffix
-                
-                ipsae_metrics = parse_ipsae_scores(ipsae_file)
-                
-                if ipsae_metrics['ipsae_score'] is not None:
-                    print(f"  ✓ {design_id}/{model_id}: IPSAE={ipsae_metrics['ipsae_score']:.3f}")
-                
-                # Store under model ID
-                for key, value in ipsae_metrics.items():
-                    all_metrics[design_id][model_id][key] = value
-    
-    # ============================================================================
-    # STEP 5: Collect PRODIGY binding affinity predictions
-    # ============================================================================
-    print(f"\n{'─'*80}")
-    print("STEP 5: Collecting PRODIGY binding affinity predictions")
-    print(f"{'─'*80}")
-    
-    prodigy_search_path = os.path.join(output_dir, prodigy_pattern)
-    prodigy_files = glob.glob(prodigy_search_path, recursive=True)
-    print(f"Found {len(prodigy_files)} PRODIGY summary files")
-    
-    for prodigy_file in prodigy_files:
-        # Extract design ID and model ID from path
-        # Pattern: {output_dir}/{design_id}/prodigy/{model_id}_prodigy_summary.csv
-        path_parts = Path(prodigy_file).parts
-        if 'prodigy' in path_parts:
-            idx = path_parts.index('prodigy')
-            if idx > 0:
-                design_id = path_parts[idx - 1]
-                model_id = Path(prodigy_file).stem.replace('_prodigy_summary', '')
-                
-                prodigy_metrics = parse_prodigy_csv(prodigy_file)
-                
-                if prodigy_metrics['predicted_binding_affinity'] is not None:
-                    print(f"  ✓ {design_id}/{model_id}: ΔG={prodigy_metrics['predicted_binding_affinity']:.2f} kcal/mol")
-                
-                # Store under model ID
-                for key, value in prodigy_metrics.items():
-                    all_metrics[design_id][model_id][key] = value
-    
-    # ============================================================================
-    # STEP 6: Collect Foldseek structural similarity results
-    # ============================================================================
-    print(f"\n{'─'*80}")
-    print("STEP 6: Collecting Foldseek structural similarity results")
-    print(f"{'─'*80}")
-    
-    foldseek_search_path = os.path.join(output_dir, foldseek_pattern)
-    foldseek_files = glob.glob(foldseek_search_path, recursive=True)
-    print(f"Found {len(foldseek_files)} Foldseek summary files")
-    
-    for foldseek_file in foldseek_files:
-        # Extract design ID and model ID from path
-        # Pattern: {output_dir}/{design_id}/foldseek/{model_id}_foldseek_summary.tsv
-        path_parts = Path(foldseek_file).parts
-        if 'foldseek' in path_parts:
-            idx = path_parts.index('foldseek')
-            if idx > 0:
-                design_id = path_parts[idx - 1]
-                model_id = Path(foldseek_file).stem.replace('_foldseek_summary', '')
-                
-                foldseek_metrics = parse_foldseek_summary(foldseek_file)
-                
-                if foldseek_metrics['foldseek_top_hit'] is not None:
-                    print(f"  ✓ {design_id}/{model_id}: {foldseek_metrics['foldseek_num_hits']} hits (top: {foldseek_metrics['foldseek_top_hit']})")
-                
-                # Store under model ID
-                for key, value in foldseek_metrics.items():
-                    all_metrics[design_id][model_id][key] = value
+        design_tasks = list(tasks_by_design.values())
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            design_results = executor.map(
+                _parse_design_files,
+                [[(category, path) for _, category, path in tasks] for tasks in design_tasks]
+            )
+            for tasks, (results, used) in zip(design_tasks, design_results):
+                _used_parse_results.update(used)
+                for ((design_id, model_id), _, _), model_metrics in zip(tasks, results):
+                    all_metrics[design_id][model_id].update(model_metrics)
+    elif model_tasks:
+        with ThreadPoolExecutor(max_workers=min(MAX_PARSE_WORKERS, len(model_tasks))) as executor:
+            futures = [
+                executor.submit(MODEL_METRIC_PARSERS[category], path)
+                for _, category, path in model_tasks
+            ]
+            for ((design_id, model_id), _, _), future in zip(model_tasks, futures):
+                all_metrics[design_id][model_id].update(future.result())
+    
+    print(f"Step 2: parsed {len(model_tasks)} per-model metric files in {time.perf_counter() - step_start:.2f}s")
     
     # ============================================================================
-    # STEP 7: Flatten the nested structure for easier ranking
+    # STEP 3: Flatten the nested structure for easier ranking
     # ============================================================================
-    print(f"\n{'─'*80}")
-    print("STEP 7: Flattening metrics for ranking")
-    print(f"{'─'*80}")
+    log(f"\n{'─'*80}")
+    log("STEP 3: Flattening metrics for ranking")
+    log(f"{'─'*80}")
     
     flattened_metrics = {}
     
@@ -660,8 +976,8 @@ def aggregate_metrics_from_directories(
         boltzgen_metrics = design_data.get('boltzgen', {})
         model_ids = design_data.get('_model_ids', [])
         
-        print(f"\n  Design: {design_id}")
-        print(f"    Boltzgen metrics: {len(boltzgen_metrics)} fields")
+        log(f"\n  Design: {design_id}")
+        log(f"    Boltzgen metrics: {len(boltzgen_metrics)} fields")
         
         # For each model/structure, create a flattened entry
         models_found = set()
@@ -669,30 +985,125 @@ def aggregate_metrics_from_directories(
             if key in ['boltzgen', '_model_ids']:
                 continue
             
-            # This is a model ID with its metrics
+            # This is a model ID with its metrics: build the flat row in one
+            # dict display (Boltzgen base metrics, model-specific metrics,
+            # then identifiers) instead of successive update() calls
             if isinstance(value, dict):
-                full_id = f"{design_id}_{key}"
-                flattened_metrics[full_id] = {}
-                
-                # Add Boltzgen base metrics
-                flattened_metrics[full_id].update(boltzgen_metrics)
-                
-                # Add model-specific metrics
-                flattened_metrics[full_id].update(value)
-                
-                # Add identifiers
-                flattened_metrics[full_id]['design_id'] = design_id
-                flattened_metrics[full_id]['model_id'] = key
+                flattened_metrics[f"{design_id}_{key}"] = {
+                    **boltzgen_metrics,
+                    **value,
+                    'design_id': design_id,
+                    'model_id': key,
+                }
                 
                 models_found.add(key)
         
-        print(f"    Models with metrics: {len(models_found)}")
+        log(f"    Models with metrics: {len(models_found)}")
     
-    print(f"\nTotal flattened entries: {len(flattened_metrics)}")
+    log(f"\nTotal flattened entries: {len(flattened_metrics)}")
     
     return flattened_metrics
 
 
+# Default composite score weights (metric -> weight)
+DEFAULT_SCORE_WEIGHTS = {
+    # Boltzgen structure quality (from aggregate_metrics)
+    'aggregate_plddt': 0.15,  # Higher is better (0-100 scale)
+    'aggregate_ptm': 1.0,  # Higher is better (0-1 scale)
+    'aggregate_iptm': 1.0,  # Higher is better (0-1 scale) - interface quality
+    
+    # Interface quality
+    'ipsae_score': -2.0,  # Lower is better, so negative weight (typically 0-20)
+    
+    # Binding affinity and interface properties
+    'predicted_binding_affinity': -0.5,  # More negative is better (kcal/mol)
+    'buried_surface_area': 0.001,  # Larger is generally better (Ų)
+    'num_interface_contacts': 0.05,  # More contacts is better
+    
+    # ProteinMPNN sequence optimization
+    'mpnn_score': -0.5,  # Lower is better (negative log probability)
+    'mpnn_seq_recovery': 0.5,  # Higher is better (0-1 scale)
+    
+    # Protenix refolding quality (validates MPNN sequences)
+    'protenix_plddt': 0.01,  # Higher is better (0-100 scale)
+    'protenix_ptm': 0.5,  # Higher is better (0-1 scale)
+    'protenix_iptm': 0.5,  # Higher is better (0-1 scale)
+}
+
+
+def build_metric_matrix(metrics_list, keys):
+    """
+    Pack metric values into a float matrix for vectorized scoring.
+    
+    Args:
+        metrics_list: list of metrics dicts (one per design)
+        keys: metric names, one per column
+    
+    Returns:
+        numpy array of shape (len(metrics_list), len(keys)), with NaN where
+        a metric is missing or not numeric
+    """
+    values = np.full((len(metrics_list), len(keys)), np.nan)
+    
+    # Fill one metric column at a time (structure-of-arrays): a column of
+    # numbers and None converts in a single NumPy call, with None becoming
+    # NaN. Only columns holding non-numeric values are converted cell by cell.
+    for j, key in enumerate(keys):
+        column = [metrics.get(key) for metrics in metrics_list]
+        try:
+            values[:, j] = np.array(column, dtype=float)
+        except (ValueError, TypeError):
+            for i, value in enumerate(column):
+                if value is not None:
+                    try:
+                        values[i, j] = float(value)
+                    except (ValueError, TypeError):
+                        continue
+    
+    return values
+
+
+def composite_score_kernel(values, weights):
+    """
+    Weighted mean of the available metrics for every row of a metric matrix.
+    
+    Args:
+        values: float array of shape (N designs, M metrics), NaN for missing
+        weights: float array of shape (M,)
+    
+    Returns:
+        tuple (scores, contributions, available, counts) where scores has
+        shape (N,), contributions (0 for missing metrics) and available (the
+        non-NaN mask) have shape (N, M), and counts holds the number of
+        metrics used per row
+    """
+    available = ~np.isnan(values)
+    filled = np.where(available, values, 0.0)
+    contributions = filled * weights
+    counts = available.sum(axis=1)
+    
+    # Accumulate the weighted metrics one column at a time, in weight order:
+    # the same summation order as adding them up design by design, so scores
+    # (and therefore ties and ranks) are reproducible to the last bit.
+    # Missing metrics contribute an exact 0.0.
+    totals = np.zeros(len(values))
+    for j in range(contributions.shape[1]):
+        totals += contributions[:, j]
+    scores = totals / np.maximum(counts, 1)
+    
+    return scores, contributions, available, counts
+
+
+def _store_score_breakdown(metrics_list, keys, scores, contributions, available, counts):
+    # Store component breakdown for debugging
+    for metrics, row, mask, count, score in zip(
+        metrics_list, contributions.tolist(), available.tolist(), counts.tolist(), scores.tolist()
+    ):
+        metrics['_score_components'] = {key: c for key, c, ok in zip(keys, row, mask) if ok}
+        metrics['_metrics_used'] = count
+        metrics['composite_score'] = score
+
+
 def calculate_composite_score(metrics, weights=None):
     """
     Calculate a composite score for ranking designs.
@@ -712,78 +1123,169 @@ def calculate_composite_score(metrics, weights=None):
         float composite score (higher is better)
     """
     if weights is None:
-        weights = {
-            # Boltzgen structure quality (from aggregate_metrics)
-            'aggregate_plddt': 0.15,  # Higher is better (0-100 scale)
-            'aggregate_ptm': 1.0,  # Higher is better (0-1 scale)
-            'aggregate_iptm': 1.0,  # Higher is better (0-1 scale) - interface quality
-            
-            # Interface quality
-            'ipsae_score': -2.0,  # Lower is better, so negative weight (typically 0-20)
-            
-            # Binding affinity and interface properties
-            'predicted_binding_affinity': -0.5,  # More negative is better (kcal/mol)
-            'buried_surface_area': 0.001,  # Larger is generally better (Ų)
-            'num_interface_contacts': 0.05,  # More contacts is better
-            
-            # ProteinMPNN sequence optimization
-            'mpnn_score': -0.5,  # Lower is better (negative log probability)
-            'mpnn_seq_recovery': 0.5,  # Higher is better (0-1 scale)
-            
-            # Protenix refolding quality (validates MPNN sequences)
-            'protenix_plddt': 0.01,  # Higher is better (0-100 scale)
-            'protenix_ptm': 0.5,  # Higher is better (0-1 scale)
-            'protenix_iptm': 0.5,  # Higher is better (0-1 scale)
-        }
-    
-    score = 0.0
-    count = 0
-    component_scores = {}
-    
-    for metric, weight in weights.items():
-        if metric in metrics and metrics[metric] is not None:
-            try:
-                metric_value = float(metrics[metric])
-                component_contribution = weight * metric_value
-                score += component_contribution
-                count += 1
-                component_scores[metric] = component_contribution
-            except (ValueError, TypeError):
-                continue
+        weights = DEFAULT_SCORE_WEIGHTS
     
-    # Normalize by number of available metrics
-    if count > 0:
-        score = score / count
+    keys = list(weights.keys())
+    values = build_metric_matrix([metrics], keys)
+    result = composite_score_kernel(values, np.array([weights[key] for key in keys], dtype=float))
+    _store_score_breakdown([metrics], keys, *result)
     
-    # Store component breakdown for debugging
-    metrics['_score_components'] = component_scores
-    metrics['_metrics_used'] = count
+    return metrics['composite_score']
+
+
+# Metrics summarized in the Markdown report
+SUMMARY_STAT_KEYS = ('ipsae_score', 'predicted_binding_affinity', 'buried_surface_area')
+
+
+def summarize_metric_matrix(values, keys):
+    """
+    Compute count, min, max and mean for each column of a metric matrix.
+    
+    Args:
+        values: (N designs x M metrics) float matrix, NaN marking missing values
+        keys: metric names of the M columns
     
-    return score
+    Returns:
+        dict mapping metric name -> (count, min, max, mean); metrics without
+        any value map to (0, None, None, None)
+    """
+    # One reduction per statistic across all columns: fmin/fmax skip NaN,
+    # and the mean sums only the available values
+    available = ~np.isnan(values)
+    counts = available.sum(axis=0)
+    mins = np.fmin.reduce(values, axis=0, initial=np.inf)
+    maxs = np.fmax.reduce(values, axis=0, initial=-np.inf)
+    means = np.where(available, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+    
+    stats = {}
+    for j, key in enumerate(keys):
+        if counts[j]:
+            stats[key] = (counts[j], mins[j], maxs[j], means[j])
+        else:
+            stats[key] = (0, None, None, None)
+    return stats
 
 
-def rank_designs(all_metrics, weights=None):
+def rank_designs(all_metrics, weights=None, top_n=None, with_stats=False):
     """
     Rank designs by composite score.
     
+    Scores are computed for all designs at once: metric values are packed
+    into an (N designs x M metrics) matrix and scored in a single call to
+    composite_score_kernel.
+    
     Args:
         all_metrics: dict mapping design_id -> metrics
         weights: optional weights for composite score
+        top_n: if set, only return the top_n designs; these are selected
+            with a partial sort instead of sorting every design, and are
+            the same designs, in the same order, as the first top_n of the
+            full ranking
+        with_stats: if True, also return summary statistics of all designs
+            (not only the top_n returned), computed from the matrix already
+            built for scoring
     
     Returns:
-        list of tuples (design_id, metrics, composite_score) sorted by score
+        list of tuples (design_id, metrics, composite_score) sorted by score,
+        or a (ranked, stats) tuple if with_stats is set (see
+        summarize_metric_matrix for the stats format)
     """
-    ranked = []
-    
-    for design_id, metrics in all_metrics.items():
-        composite_score = calculate_composite_score(metrics, weights)
-        metrics['composite_score'] = composite_score
-        ranked.append((design_id, metrics, composite_score))
-    
-    # Sort by composite score (descending - higher is better)
-    ranked.sort(key=lambda x: x[2], reverse=True)
+    if weights is None:
+        weights = DEFAULT_SCORE_WEIGHTS
+    
+    keys = list(weights.keys())
+    design_ids = list(all_metrics.keys())
+    metrics_list = list(all_metrics.values())
+    
+    values = build_metric_matrix(metrics_list, keys)
+    result = composite_score_kernel(values, np.array([weights[key] for key in keys], dtype=float))
+    _store_score_breakdown(metrics_list, keys, *result)
+    
+    # Sort by composite score (descending - higher is better); a stable sort
+    # keeps the original order of tied designs
+    neg_scores = -result[0]
+    if top_n is not None and top_n < len(design_ids):
+        # Find the top_n-th score with a partial sort, then keep every design
+        # scoring at least as well, so designs tied at the boundary are all
+        # candidates; a stable sort of the candidates (in index order) then
+        # picks the same designs as sorting everything
+        if top_n > 0:
+            kth = np.partition(neg_scores, top_n - 1)[top_n - 1]
+            candidates = np.flatnonzero(~(neg_scores > kth))
+            order = candidates[np.argsort(neg_scores[candidates], kind='stable')[:top_n]]
+        else:
+            order = np.array([], dtype=int)
+    else:
+        order = np.argsort(neg_scores, kind='stable')
+    
+    ranked = [(design_ids[i], metrics_list[i], metrics_list[i]['composite_score']) for i in order.tolist()]
+    if not with_stats:
+        return ranked
+    
+    # Reuse the scoring columns for the summary metrics; only metrics that
+    # are not weighted need to be gathered from the designs. The statistics
+    # cover every design, also when only the top_n are returned.
+    missing = [key for key in SUMMARY_STAT_KEYS if key not in keys]
+    extra = build_metric_matrix(metrics_list, missing) if missing else None
+    columns = [
+        values[:, keys.index(key)] if key in keys else extra[:, missing.index(key)]
+        for key in SUMMARY_STAT_KEYS
+    ]
+    stats_values = np.column_stack(columns) if metrics_list else np.empty((0, len(SUMMARY_STAT_KEYS)))
+    return ranked, summarize_metric_matrix(stats_values, SUMMARY_STAT_KEYS)
+
+
+# Column order of the summary reports - most important metrics first
+REPORT_PRIORITY_COLUMNS = [
+    'design_id',
+    'model_id',
+    'rank',
+    'composite_score',
+    '_metrics_used',
+    
+    # Boltzgen original design quality
+    'aggregate_plddt',
+    'aggregate_ptm',
+    'aggregate_iptm',
+    'aggregate_pae_interaction',
+    
+    # ProteinMPNN sequence optimization
+    'mpnn_score',
+    'mpnn_global_score',
+    'mpnn_seq_recovery',
+    'mpnn_num_sequences',
+    
+    # Protenix refolding (if MPNN was run)
+    'protenix_plddt',
+    'protenix_ptm',
+    'protenix_iptm',
+    'protenix_ranking_score',
+    
+    # Interface quality
+    'ipsae_score',
+    
+    # Binding affinity
+    'predicted_binding_affinity',
+    'predicted_kd',
+    'buried_surface_area',
+    'num_interface_contacts',
+    
+    # Structural similarity
+    'foldseek_top_hit',
+    'foldseek_top_evalue',
+    'foldseek_top_bits',
+    'foldseek_num_hits',
+]
+
+
+def _report_fieldnames(ranked_designs):
+    # Priority columns, then any remaining metrics in alphabetical order
+    all_metrics_keys = set()
+    for _, metrics, _ in ranked_designs:
+        all_metrics_keys.update(metrics.keys())
     
-    return ranked
+    other_columns = sorted(all_metrics_keys - set(REPORT_PRIORITY_COLUMNS))
+    return REPORT_PRIORITY_COLUMNS + other_columns
 
 
 def write_summary_report(ranked_designs, output_file):
@@ -798,74 +1300,136 @@ def write_summary_report(ranked_designs, output_file):
         print("Warning: No designs to report", file=sys.stderr)
         # Create empty CSV with headers
         with open(output_file, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=['design_id', 'rank', 'composite_score'])
-            writer.writeheader()
+            csv.writer(csvfile).writerow(['design_id', 'rank', 'composite_score'])
         return
     
-    # Determine all available metrics
-    all_metrics_keys = set()
-    for _, metrics, _ in ranked_designs:
-        all_metrics_keys.update(metrics.keys())
-    
-    # Define column order - prioritize most important metrics
-    priority_columns = [
-        'design_id',
-        'model_id',
-        'rank',
-        'composite_score',
-        '_metrics_used',
-        
-        # Boltzgen original design quality
-        'aggregate_plddt',
-        'aggregate_ptm',
-        'aggregate_iptm',
-        'aggregate_pae_interaction',
-        
-        # ProteinMPNN sequence optimization
-        'mpnn_score',
-        'mpnn_global_score',
-        'mpnn_seq_recovery',
-        'mpnn_num_sequences',
-        
-        # Protenix refolding (if MPNN was run)
-        'protenix_plddt',
-        'protenix_ptm',
-        'protenix_iptm',
-        'protenix_ranking_score',
-        
-        # Interface quality
-        'ipsae_score',
-        
-        # Binding affinity
-        'predicted_binding_affinity',
-        'predicted_kd',
-        'buried_surface_area',
-        'num_interface_contacts',
-        
-        # Structural similarity
-        'foldseek_top_hit',
-        'foldseek_top_evalue',
-        'foldseek_top_bits',
-        'foldseek_num_hits',
-    ]
+    fieldnames = _report_fieldnames(ranked_designs)
     
-    # Add any remaining columns not in priority list
-    other_columns = sorted(all_metrics_keys - set(priority_columns))
-    fieldnames = priority_columns + other_columns
+    design_id_index = fieldnames.index('design_id')
+    rank_index = fieldnames.index('rank')
     
-    with open(output_file, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
-        
+    def rows():
+        # Read each row straight from the metrics dict (missing metrics are
+        # written as empty cells), then fill in the ranked ID and the rank
+        # unless the metrics carry their own (they normally have design_id)
         for rank, (design_id, metrics, composite_score) in enumerate(ranked_designs, 1):
-            row = {'design_id': design_id, 'rank': rank}
-            row.update(metrics)
-            writer.writerow(row)
+            get = metrics.get
+            row = [get(key, '') for key in fieldnames]
+            if 'design_id' not in metrics:
+                row[design_id_index] = design_id
+            if 'rank' not in metrics:
+                row[rank_index] = rank
+            yield row
+    
+    with open(output_file, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        writer.writerows(rows())
     
     print(f"Successfully wrote summary report to {output_file}")
 
 
-def write_markdown_report(ranked_designs, output_file, top_n=10):
+def write_parquet_report(ranked_designs, output_file):
+    """
+    Write the summary report as a zstd-compressed Parquet file.
+    
+    Same rows and columns as the CSV summary, stored column by column with
+    types, so downstream analysis does not have to re-parse text. Requires
+    pyarrow; the report is skipped with a warning if it is not installed.
+    
+    Args:
+        ranked_designs: list of (design_id, metrics, composite_score) tuples
+        output_file: path to output Parquet file
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print(f"Warning: pyarrow is not installed, skipping Parquet report {output_file}", file=sys.stderr)
+        return
+    
+    fieldnames = _report_fieldnames(ranked_designs) if ranked_designs else ['design_id', 'rank', 'composite_score']
+    rows = []
+    for rank, (design_id, metrics, composite_score) in enumerate(ranked_designs, 1):
+        row = {'design_id': design_id, 'rank': rank}
+        row.update(metrics)
+        rows.append(row)
+    
+    columns = {}
+    for name in fieldnames:
+        column = [row.get(name) for row in rows]
+        # Columns mixing numbers with text (or holding nested values) are
+        # stored as strings, as they appear in the CSV
+        if not all(value is None or isinstance(value, (int, float)) for value in column):
+            column = [None if value is None else str(value) for value in column]
+        columns[name] = column
+    
+    pq.write_table(pa.table(columns), output_file, compression='zstd')
+    
+    print(f"Successfully wrote Parquet report to {output_file}")
+
+
+# Row of the Markdown top designs table
+MARKDOWN_TOP_ROW = (
+    "| {rank} | {design} | {model} | {score:.3f} | "
+    "{boltz_plddt} | {boltz_iptm} | {ipsae} | {affinity} | {mpnn} | {protenix_plddt} |\n"
+)
+
+# Static sections of the Markdown report, written with a single call each
+MARKDOWN_INTERPRETATION_GUIDE = """\
+
+## Interpretation Guide
+
+### Overall Quality
+- **Composite Score**: Weighted combination of all metrics (higher is better)
+- **Metrics Used**: Number of metrics available for this design (more is better)
+
+### Boltzgen Original Design Quality
+- **Boltz pLDDT**: Per-residue confidence score, 0-100 (>80 is good, >90 is excellent)
+- **Boltz pTM**: Predicted TM-score, 0-1 (>0.5 is good, >0.8 is excellent)
+- **Boltz ipTM**: Interface predicted TM-score, 0-1 (>0.5 is good, >0.8 is excellent)
+- **Boltz PAE Interaction**: Predicted aligned error at interface (lower is better)
+
+### ProteinMPNN Sequence Optimization
+- **MPNN Score**: Negative log probability of sequence (lower is better, typically 1-5)
+- **MPNN Global Score**: Overall sequence likelihood (lower is better)
+- **MPNN Seq Recovery**: Fraction of original residues kept, 0-1 (indicates design novelty)
+
+### Protenix Refolding Validation
+- **Protenix pLDDT**: Confidence after refolding with MPNN sequence, 0-100
+- **Protenix pTM**: Predicted TM-score after refolding, 0-1
+- **Protenix ipTM**: Interface quality after refolding, 0-1
+- Good Protenix scores validate that MPNN sequences fold correctly
+
+### Interface Quality
+- **IPSAE**: Interface PAE score (lower is better, <5 excellent, <10 good)
+- Measures confidence in interface residue positioning
+
+### Binding Affinity (PRODIGY)
+- **ΔG**: Predicted binding free energy in kcal/mol (more negative is stronger)
+- **Kd**: Predicted dissociation constant in M (lower indicates tighter binding)
+- **BSA**: Buried surface area in Ų (larger generally indicates more interaction)
+- **Contacts**: Number of interface residue contacts
+
+### Structural Similarity (Foldseek)
+- **Top Hit**: Most similar structure in database
+- **E-value**: Statistical significance (lower is more significant)
+- **Bits**: Alignment score (higher is better)
+
+"""
+
+MARKDOWN_NEXT_STEPS = """\
+### Next Steps
+
+1. **Structural Review**: Examine PDB/CIF structures for the top 3-5 designs
+2. **Sequence Analysis**: Review ProteinMPNN optimized sequences and compare to originals
+3. **Validation**: Consider additional computational validation (MD simulations, docking)
+4. **Experimental Testing**: Prioritize top designs for experimental characterization
+5. **Detailed Comparison**: Use the full CSV for in-depth comparison of all designs
+"""
+
+
+def write_markdown_report(ranked_designs, output_file, top_n=10, stats=None, total_designs=None):
     """
     Write a human-readable Markdown report.
     
@@ -873,39 +1437,55 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
         ranked_designs: list of (design_id, metrics, composite_score) tuples
         output_file: path to output Markdown file
         top_n: number of top designs to highlight
+        stats: optional summary statistics from rank_designs(with_stats=True);
+            computed from ranked_designs if not given
+        total_designs: number of designs analyzed, if ranked_designs holds
+            only the top ones (default: len(ranked_designs))
     """
-    with open(output_file, 'w') as f:
-        f.write("# Protein Design Consolidation Report\n\n")
-        f.write(f"**Total Designs Analyzed:** {len(ranked_designs)}\n\n")
+    if total_designs is None:
+        total_designs = len(ranked_designs)
+    
+    with open(output_file, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+        # Buffer the report and write it out in one call
+        parts = []
+        write = parts.append
+        write("# Protein Design Consolidation Report\n\n")
+        write(f"**Total Designs Analyzed:** {total_designs}\n\n")
         
         if not ranked_designs:
-            f.write("No designs found.\n")
+            write("No designs found.\n")
+            f.write(''.join(parts))
             return
         
-        f.write("## Summary Statistics\n\n")
+        write("## Summary Statistics\n\n")
+        
+        # Summary statistics normally come from rank_designs; compute them
+        # here only when the caller did not pass them in
+        if stats is None:
+            values = build_metric_matrix([m for _, m, _ in ranked_designs], SUMMARY_STAT_KEYS)
+            stats = summarize_metric_matrix(values, SUMMARY_STAT_KEYS)
         
-        # Calculate summary statistics
-        all_ipsae = [m.get('ipsae_score') for _, m, _ in ranked_designs if m.get('ipsae_score') is not None]
-        all_affinity = [m.get('predicted_binding_affinity') for _, m, _ in ranked_designs if m.get('predicted_binding_affinity') is not None]
-        all_bsa = [m.get('buried_surface_area') for _, m, _ in ranked_designs if m.get('buried_surface_area') is not None]
+        ipsae_n, ipsae_min, ipsae_max, ipsae_mean = stats['ipsae_score']
+        affinity_n, affinity_min, affinity_max, affinity_mean = stats['predicted_binding_affinity']
+        bsa_n, bsa_min, bsa_max, bsa_mean = stats['buried_surface_area']
         
-        if all_ipsae:
-            f.write(f"- **IPSAE Scores:** {len(all_ipsae)} designs\n")
-            f.write(f"  - Min: {min(all_ipsae):.3f}, Max: {max(all_ipsae):.3f}, Mean: {sum(all_ipsae)/len(all_ipsae):.3f}\n")
+        if ipsae_n:
+            write(f"- **IPSAE Scores:** {ipsae_n} designs\n")
+            write(f"  - Min: {ipsae_min:.3f}, Max: {ipsae_max:.3f}, Mean: {ipsae_mean:.3f}\n")
         
-        if all_affinity:
-            f.write(f"- **Binding Affinity (ΔG):** {len(all_affinity)} designs\n")
-            f.write(f"  - Min: {min(all_affinity):.3f} kcal/mol, Max: {max(all_affinity):.3f} kcal/mol, Mean: {sum(all_affinity)/len(all_affinity):.3f} kcal/mol\n")
+        if affinity_n:
+            write(f"- **Binding Affinity (ΔG):** {affinity_n} designs\n")
+            write(f"  - Min: {affinity_min:.3f} kcal/mol, Max: {affinity_max:.3f} kcal/mol, Mean: {affinity_mean:.3f} kcal/mol\n")
         
-        if all_bsa:
-            f.write(f"- **Buried Surface Area:** {len(all_bsa)} designs\n")
-            f.write(f"  - Min: {min(all_bsa):.1f} Ų, Max: {max(all_bsa):.1f} Ų, Mean: {sum(all_bsa)/len(all_bsa):.1f} Ų\n")
+        if bsa_n:
+            write(f"- **Buried Surface Area:** {bsa_n} designs\n")
+            write(f"  - Min: {bsa_min:.1f} Ų, Max: {bsa_max:.1f} Ų, Mean: {bsa_mean:.1f} Ų\n")
         
-        f.write(f"\n## Top {top_n} Designs (by Composite Score)\n\n")
+        write(f"\n## Top {top_n} Designs (by Composite Score)\n\n")
         
         # Write table header with all key metrics
-        f.write("| Rank | Design | Model | Score | Boltz pLDDT | Boltz ipTM | IPSAE | ΔG | MPNN Score | Protenix pLDDT |\n")
-        f.write("|------|--------|-------|-------|-------------|------------|-------|----|-----------|-----------------|\n")
+        write("| Rank | Design | Model | Score | Boltz pLDDT | Boltz ipTM | IPSAE | ΔG | MPNN Score | Protenix pLDDT |\n")
+        write("|------|--------|-------|-------|-------------|------------|-------|----|-----------|-----------------|\n")
         
         # Write top N designs
         for rank, (full_id, metrics, composite_score) in enumerate(ranked_designs[:top_n], 1):
@@ -913,76 +1493,59 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
             model_id = metrics.get('model_id', '-')
             
             # Format metrics with proper handling of None values
-            boltz_plddt = f"{metrics.get('aggregate_plddt', 0):.1f}" if metrics.get('aggregate_plddt') else "N/A"
-            boltz_iptm = f"{metrics.get('aggregate_iptm', 0):.3f}" if metrics.get('aggregate_iptm') else "N/A"
-            ipsae = f"{metrics.get('ipsae_score', 0):.2f}" if metrics.get('ipsae_score') else "N/A"
-            affinity = f"{metrics.get('predicted_binding_affinity', 0):.1f}" if metrics.get('predicted_binding_affinity') else "N/A"
-            mpnn = f"{metrics.get('mpnn_score', 0):.2f}" if metrics.get('mpnn_score') else "N/A"
-            protenix_plddt = f"{metrics.get('protenix_plddt', 0):.1f}" if metrics.get('protenix_plddt') else "N/A"
+            # (look each metric up once and reuse the bound value)
+            boltz_plddt_v = metrics.get('aggregate_plddt')
+            boltz_iptm_v = metrics.get('aggregate_iptm')
+            ipsae_v = metrics.get('ipsae_score')
+            affinity_v = metrics.get('predicted_binding_affinity')
+            mpnn_v = metrics.get('mpnn_score')
+            protenix_plddt_v = metrics.get('protenix_plddt')
+            
+            boltz_plddt = f"{boltz_plddt_v:.1f}" if boltz_plddt_v else "N/A"
+            boltz_iptm = f"{boltz_iptm_v:.3f}" if boltz_iptm_v else "N/A"
+            ipsae = f"{ipsae_v:.2f}" if ipsae_v else "N/A"
+            affinity = f"{affinity_v:.1f}" if affinity_v else "N/A"
+            mpnn = f"{mpnn_v:.2f}" if mpnn_v else "N/A"
+            protenix_plddt = f"{protenix_plddt_v:.1f}" if protenix_plddt_v else "N/A"
             
             # Truncate long IDs for table readability
             display_design = design_id[:20] + "..." if len(design_id) > 23 else design_id
             display_model = model_id[:15] + "..." if len(model_id) > 18 else model_id
             
-            f.write(f"| {rank} | {display_design} | {display_model} | {composite_score:.3f} | "
-                   f"{boltz_plddt} | {boltz_iptm} | {ipsae} | {affinity} | {mpnn} | {protenix_plddt} |\n")
-        
-        f.write("\n## Interpretation Guide\n\n")
-        f.write("### Overall Quality\n")
-        f.write("- **Composite Score**: Weighted combination of all metrics (higher is better)\n")
-        f.write("- **Metrics Used**: Number of metrics available for this design (more is better)\n\n")
-        
-        f.write("### Boltzgen Original Design Quality\n")
-        f.write("- **Boltz pLDDT**: Per-residue confidence score, 0-100 (>80 is good, >90 is excellent)\n")
-        f.write("- **Boltz pTM**: Predicted TM-score, 0-1 (>0.5 is good, >0.8 is excellent)\n")
-        f.write("- **Boltz ipTM**: Interface predicted TM-score, 0-1 (>0.5 is good, >0.8 is excellent)\n")
-        f.write("- **Boltz PAE Interaction**: Predicted aligned error at interface (lower is better)\n\n")
+            write(MARKDOWN_TOP_ROW.format_map({
+                'rank': rank,
+                'design': display_design,
+                'model': display_model,
+                'score': composite_score,
+                'boltz_plddt': boltz_plddt,
+                'boltz_iptm': boltz_iptm,
+                'ipsae': ipsae,
+                'affinity': affinity,
+                'mpnn': mpnn,
+                'protenix_plddt': protenix_plddt,
+            }))
         
-        f.write("### ProteinMPNN Sequence Optimization\n")
-        f.write("- **MPNN Score**: Negative log probability of sequence (lower is better, typically 1-5)\n")
-        f.write("- **MPNN Global Score**: Overall sequence likelihood (lower is better)\n")
-        f.write("- **MPNN Seq Recovery**: Fraction of original residues kept, 0-1 (indicates design novelty)\n\n")
+        write(MARKDOWN_INTERPRETATION_GUIDE)
         
-        f.write("### Protenix Refolding Validation\n")
-        f.write("- **Protenix pLDDT**: Confidence after refolding with MPNN sequence, 0-100\n")
-        f.write("- **Protenix pTM**: Predicted TM-score after refolding, 0-1\n")
-        f.write("- **Protenix ipTM**: Interface quality after refolding, 0-1\n")
-        f.write("- Good Protenix scores validate that MPNN sequences fold correctly\n\n")
-        
-        f.write("### Interface Quality\n")
-        f.write("- **IPSAE**: Interface PAE score (lower is better, <5 excellent, <10 good)\n")
-        f.write("- Measures confidence in interface residue positioning\n\n")
-        
-        f.write("### Binding Affinity (PRODIGY)\n")
-        f.write("- **ΔG**: Predicted binding free energy in kcal/mol (more negative is stronger)\n")
-        f.write("- **Kd**: Predicted dissociation constant in M (lower indicates tighter binding)\n")
-        f.write("- **BSA**: Buried surface area in Ų (larger generally indicates more interaction)\n")
-        f.write("- **Contacts**: Number of interface residue contacts\n\n")
-        
-        f.write("### Structural Similarity (Foldseek)\n")
-        f.write("- **Top Hit**: Most similar structure in database\n")
-        f.write("- **E-value**: Statistical significance (lower is more significant)\n")
-        f.write("- **Bits**: Alignment score (higher is better)\n\n")
-        
-        f.write("## Recommendations\n\n")
+        write("## Recommendations\n\n")
         
         if ranked_designs:
             best_design = ranked_designs[0]
             best_id = best_design[0]
             best_metrics = best_design[1]
             
-            f.write(f"### Top Design: `{best_id}`\n\n")
-            f.write(f"**Composite Score:** {best_design[2]:.3f} (based on {best_metrics.get('_metrics_used', 0)} metrics)\n\n")
+            write(f"### Top Design: `{best_id}`\n\n")
+            write(f"**Composite Score:** {best_design[2]:.3f} (based on {best_metrics.get('_metrics_used', 0)} metrics)\n\n")
             
             # Provide detailed analysis of the top design
-            f.write("**Quality Assessment:**\n\n")
+            write("**Quality Assessment:**\n\n")
             
             recommendations = []
             warnings = []
             
             # Boltzgen structure quality
-            if best_metrics.get('aggregate_plddt'):
-                plddt = best_metrics['aggregate_plddt']
+            plddt = best_metrics.get('aggregate_plddt')
+            if plddt:
                 if plddt > 90:
                     recommendations.append(f"✅ Excellent Boltzgen pLDDT: {plddt:.1f}")
                 elif plddt > 80:
@@ -990,8 +1553,8 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
                 else:
                     warnings.append(f"⚠️  Moderate Boltzgen pLDDT: {plddt:.1f}")
             
-            if best_metrics.get('aggregate_iptm'):
-                iptm = best_metrics['aggregate_iptm']
+            iptm = best_metrics.get('aggregate_iptm')
+            if iptm:
                 if iptm > 0.8:
                     recommendations.append(f"✅ Excellent Boltzgen interface quality (ipTM: {iptm:.3f})")
                 elif iptm > 0.5:
@@ -1000,8 +1563,8 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
                     warnings.append(f"⚠️  Moderate Boltzgen interface quality (ipTM: {iptm:.3f})")
             
             # IPSAE interface quality
-            if best_metrics.get('ipsae_score'):
-                ipsae = best_metrics['ipsae_score']
+            ipsae = best_metrics.get('ipsae_score')
+            if ipsae:
                 if ipsae < 5.0:
                     recommendations.append(f"✅ Excellent interface confidence (IPSAE: {ipsae:.2f})")
                 elif ipsae < 10.0:
@@ -1010,8 +1573,8 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
                     warnings.append(f"⚠️  Moderate interface confidence (IPSAE: {ipsae:.2f})")
             
             # ProteinMPNN optimization
-            if best_metrics.get('mpnn_score'):
-                mpnn = best_metrics['mpnn_score']
+            mpnn = best_metrics.get('mpnn_score')
+            if mpnn:
                 if mpnn < 2.0:
                     recommendations.append(f"✅ Excellent MPNN sequence optimization (score: {mpnn:.2f})")
                 elif mpnn < 4.0:
@@ -1019,8 +1582,8 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
                 else:
                     warnings.append(f"⚠️  Moderate MPNN sequence optimization (score: {mpnn:.2f})")
             
-            if best_metrics.get('mpnn_seq_recovery'):
-                recovery = best_metrics['mpnn_seq_recovery']
+            recovery = best_metrics.get('mpnn_seq_recovery')
+            if recovery:
                 if recovery < 0.3:
                     recommendations.append(f"✅ Highly novel sequence (recovery: {recovery:.2f})")
                 elif recovery < 0.7:
@@ -1029,8 +1592,8 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
                     recommendations.append(f"ℹ️  Conservative sequence design (recovery: {recovery:.2f})")
             
             # Protenix refolding validation
-            if best_metrics.get('protenix_plddt'):
-                protenix_plddt = best_metrics['protenix_plddt']
+            protenix_plddt = best_metrics.get('protenix_plddt')
+            if protenix_plddt:
                 if protenix_plddt > 85:
                     recommendations.append(f"✅ MPNN sequence folds well (Protenix pLDDT: {protenix_plddt:.1f})")
                 elif protenix_plddt > 70:
@@ -1039,8 +1602,8 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
                     warnings.append(f"⚠️  MPNN sequence may not fold well (Protenix pLDDT: {protenix_plddt:.1f})")
             
             # Binding affinity
-            if best_metrics.get('predicted_binding_affinity'):
-                affinity = best_metrics['predicted_binding_affinity']
+            affinity = best_metrics.get('predicted_binding_affinity')
+            if affinity:
                 if affinity < -10.0:
                     recommendations.append(f"✅ Strong predicted binding (ΔG: {affinity:.1f} kcal/mol)")
                 elif affinity < -5.0:
@@ -1048,8 +1611,8 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
                 else:
                     warnings.append(f"⚠️  Weak predicted binding (ΔG: {affinity:.1f} kcal/mol)")
             
-            if best_metrics.get('buried_surface_area'):
-                bsa = best_metrics['buried_surface_area']
+            bsa = best_metrics.get('buried_surface_area')
+            if bsa:
                 if bsa > 1500:
                     recommendations.append(f"✅ Large interface (BSA: {bsa:.0f} Ų)")
                 elif bsa > 800:
@@ -1059,23 +1622,20 @@ def write_markdown_report(ranked_designs, output_file, top_n=10):
             
             # Print recommendations and warnings
             if recommendations:
-                f.write("**Strengths:**\n")
+                write("**Strengths:**\n")
                 for rec in recommendations:
-                    f.write(f"- {rec}\n")
-                f.write("\n")
+                    write(f"- {rec}\n")
+                write("\n")
             
             if warnings:
-                f.write("**Considerations:**\n")
+                write("**Considerations:**\n")
                 for warn in warnings:
-                    f.write(f"- {warn}\n")
-                f.write("\n")
+                    write(f"- {warn}\n")
+                write("\n")
             
-            f.write("### Next Steps\n\n")
-            f.write("1. **Structural Review**: Examine PDB/CIF structures for the top 3-5 designs\n")
-            f.write("2. **Sequence Analysis**: Review ProteinMPNN optimized sequences and compare to originals\n")
-            f.write("3. **Validation**: Consider additional computational validation (MD simulations, docking)\n")
-            f.write("4. **Experimental Testing**: Prioritize top designs for experimental characterization\n")
-            f.write("5. **Detailed Comparison**: Use the full CSV for in-depth comparison of all designs\n")
+            write(MARKDOWN_NEXT_STEPS)
+        
+        f.write(''.join(parts))
     
     print(f"Successfully wrote Markdown report to {output_file}")
 
@@ -1115,31 +1675,73 @@ def main():
         default='*/prodigy/*_prodigy_summary.csv',
         help='Glob pattern to find PRODIGY CSV files'
     )
+    parser.add_argument(
+        '--output_parquet',
+        default=None,
+        help='Optional Parquet copy of the summary report (requires pyarrow)'
+    )
+    parser.add_argument(
+        '--cache_file',
+        default=None,
+        help='Persistent cache of parsed metric files, reused across runs (disabled by default). '
+             'The cache is a pickle file: only use a trusted path written by this script'
+    )
+    parser.add_argument(
+        '--top_only',
+        action='store_true',
+        help='Only rank and report the top_n designs (partial sort; the CSV then lists only those designs)'
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Print per-step diagnostic output while collecting metrics'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Worker processes for per-model metric parsing, one design per task (default: 1, uses threads)'
+    )
     
     args = parser.parse_args()
     
     print(f"Consolidating metrics from: {args.output_dir}")
     
+    if args.cache_file:
+        num_cached = load_parse_cache(args.cache_file)
+        print(f"Loaded {num_cached} cached parse results from {args.cache_file}")
+    
     # Aggregate all metrics
     all_metrics = aggregate_metrics_from_directories(
         args.output_dir,
         ipsae_pattern=args.ipsae_pattern,
-        prodigy_pattern=args.prodigy_pattern
+        prodigy_pattern=args.prodigy_pattern,
+        verbose=args.verbose,
+        processes=args.processes
     )
     
+    if args.cache_file:
+        save_parse_cache(args.cache_file)
+    
     print(f"Found metrics for {len(all_metrics)} designs")
     
     # Rank designs
-    ranked_designs = rank_designs(all_metrics)
+    ranked_designs, stats = rank_designs(
+        all_metrics, top_n=args.top_n if args.top_only else None, with_stats=True
+    )
     
     # Write reports
     write_summary_report(ranked_designs, args.output_csv)
-    write_markdown_report(ranked_designs, args.output_markdown, top_n=args.top_n)
+    if args.output_parquet:
+        write_parquet_report(ranked_designs, args.output_parquet)
+    write_markdown_report(
+        ranked_designs, args.output_markdown, top_n=args.top_n, stats=stats, total_designs=len(all_metrics)
+    )
     
     print("\n" + "="*60)
     print("CONSOLIDATION COMPLETE")
     print("="*60)
-    print(f"Total designs analyzed: {len(ranked_designs)}")
+    print(f"Total designs analyzed: {len(all_metrics)}")
     if ranked_designs:
         print(f"Top ranked design: {ranked_designs[0][0]} (score: {ranked_designs[0][2]:.3f})")
     print(f"Summary CSV: {args.output_csv}")
@@ -7,6 +7,7 @@ confidence JSON files and converts it to NPZ format that can be used by ipSAE.
 
 Usage:
     python convert_protenix_to_npz.py <input.json> <output.npz>
+    python convert_protenix_to_npz.py --batch <input_dir> <output_dir>
 
 Input:
     - Protenix confidence JSON file (e.g., *_confidence*.json)
@@ -19,8 +20,53 @@ import json
 import numpy as np
 import argparse
 import sys
+from multiprocessing import Pool
 from pathlib import Path
 
+# orjson is a much faster JSON parser; fall back to the standard library
+# when it is not installed (its decode errors subclass json.JSONDecodeError)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """
+    Decode JSON with orjson when available, falling back to json.loads.
+    
+    orjson rejects the NaN/Infinity tokens that json.loads accepts, so
+    documents it cannot decode are retried with the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def to_pae_array(value):
+    """
+    Convert PAE JSON data to a float32 numpy array.
+    
+    Exits with an error if any entry is not a number (null, strings,
+    nested objects or ragged rows).
+    """
+    try:
+        pae_matrix = np.asarray(value)
+    except (TypeError, ValueError):
+        print("ERROR: PAE matrix is not numeric")
+        sys.exit(1)
+    
+    # null entries give an object array and strings a string array; only
+    # integer and float arrays hold numbers throughout
+    if pae_matrix.dtype.kind not in 'iuf':
+        print("ERROR: PAE matrix is not numeric")
+        sys.exit(1)
+    
+    return pae_matrix.astype(np.float32, copy=False)
+
 
 def find_pae_matrix(data, verbose=True):
     """
@@ -34,7 +80,9 @@ def find_pae_matrix(data, verbose=True):
         verbose: Print search progress
         
     Returns:
-        numpy array of PAE matrix or None if not found
+        float32 numpy array of PAE matrix or None if not found. The JSON
+        lists are converted straight to float32 (the dtype AlphaFold outputs
+        use), so no intermediate float64 copy of the matrix is made.
     """
     # Common top-level keys for PAE data
     keys_to_check = [
@@ -48,7 +96,7 @@ def find_pae_matrix(data, verbose=True):
     # Check top-level keys first
     for key in keys_to_check:
         if key in data:
-            pae_matrix = np.array(data[key])
+            pae_matrix = to_pae_array(data[key])
             if verbose:
                 print(f"✓ Found PAE matrix under key: '{key}'")
             return pae_matrix
@@ -72,7 +120,7 @@ def find_pae_matrix(data, verbose=True):
                 break
         
         if found:
-            pae_matrix = np.array(temp_data)
+            pae_matrix = to_pae_array(temp_data)
             if verbose:
                 print(f"✓ Found PAE matrix at nested path: {' -> '.join(path)}")
             return pae_matrix
@@ -80,12 +128,14 @@ def find_pae_matrix(data, verbose=True):
     return None
 
 
-def validate_pae_matrix(pae_matrix):
+def validate_pae_matrix(pae_matrix, value_range=None):
     """
     Validate PAE matrix format and values.
     
     Args:
         pae_matrix: numpy array to validate
+        value_range: optional precomputed (min, max) of the matrix, so the
+            range check does not scan the matrix again
         
     Returns:
         bool: True if valid, False otherwise
@@ -100,17 +150,24 @@ def validate_pae_matrix(pae_matrix):
         print(f"ERROR: PAE matrix must be square, got shape {pae_matrix.shape}")
         return False
     
-    # Check value range (PAE typically 0-30 Angstroms)
-    if np.any(pae_matrix < 0):
-        print(f"WARNING: PAE contains negative values (min: {pae_matrix.min()})")
-    
-    if np.any(pae_matrix > 100):
-        print(f"WARNING: PAE contains unusually large values (max: {pae_matrix.max()})")
+    # Check value range (PAE typically 0-30 Angstroms) from the min and max
+    # instead of separate full-matrix comparisons
+    if pae_matrix.size:
+        if value_range is None:
+            value_range = (pae_matrix.min(), pae_matrix.max())
+        pae_min, pae_max = value_range
+        
+        if pae_min < 0:
+            print(f"WARNING: PAE contains negative values (min: {pae_min})")
+        
+        if pae_max > 100:
+            print(f"WARNING: PAE contains unusually large values (max: {pae_max})")
     
     return True
 
 
-def convert_protenix_to_ipsae(json_path, output_path, verbose=True):
+def convert_protenix_to_ipsae(json_path, output_path, verbose=True, compression='zlib', symmetrize=False,
+                              mmap_friendly=False):
     """
     Main conversion function.
     
@@ -118,6 +175,15 @@ def convert_protenix_to_ipsae(json_path, output_path, verbose=True):
         json_path: Path to input Protenix JSON file
         output_path: Path to output NPZ file
         verbose: Print progress messages
+        compression: 'zlib' for a compressed NPZ, or 'none' to skip the
+            (single-threaded, CPU-bound) DEFLATE step for transient files
+        symmetrize: Replace the PAE matrix with the mean of itself and its
+            transpose. PAE is not symmetric by definition, so this changes
+            the ipSAE input; only use it when symmetric errors are wanted.
+        mmap_friendly: Save a plain C-contiguous .npy file (output_path with
+            a .npy suffix) instead of an NPZ, so consumers can open it with
+            np.load(..., mmap_mode='r') without copying or decompressing.
+            ipSAE itself expects an NPZ.
     """
     if verbose:
         print("=" * 60)
@@ -129,8 +195,8 @@ def convert_protenix_to_ipsae(json_path, output_path, verbose=True):
     
     # Load JSON file
     try:
-        with open(json_path, 'r') as f:
-            data = json.load(f)
+        with open(json_path, 'rb') as f:
+            data = json_loads(f.read())
         if verbose:
             print(f"✓ Successfully loaded JSON file")
     except FileNotFoundError:
@@ -162,23 +228,28 @@ def convert_protenix_to_ipsae(json_path, output_path, verbose=True):
         
         sys.exit(1)
     
-    # Validate matrix
+    # Validate matrix, scanning for the value range only once
+    value_range = (pae_matrix.min(), pae_matrix.max()) if pae_matrix.size else None
+    
     if verbose:
         print(f"\nValidating PAE matrix...")
         print(f"  Shape: {pae_matrix.shape}")
         print(f"  Data type: {pae_matrix.dtype}")
-        print(f"  Value range: [{pae_matrix.min():.2f}, {pae_matrix.max():.2f}]")
-        print(f"  Mean PAE: {pae_matrix.mean():.2f}")
+        if value_range is not None:
+            print(f"  Value range: [{value_range[0]:.2f}, {value_range[1]:.2f}]")
+            print(f"  Mean PAE: {pae_matrix.mean():.2f}")
     
-    if not validate_pae_matrix(pae_matrix):
+    if not validate_pae_matrix(pae_matrix, value_range):
         print("\nERROR: PAE matrix validation failed")
         sys.exit(1)
     
-    # Convert to float32 for consistency with AlphaFold outputs
-    if pae_matrix.dtype != np.float32:
+    if symmetrize:
         if verbose:
-            print(f"\nConverting from {pae_matrix.dtype} to float32...")
-        pae_matrix = pae_matrix.astype(np.float32)
+            print(f"\nSymmetrizing PAE matrix...")
+        # One temporary for the sum, then halved in place (pae_matrix += pae_matrix.T
+        # would read values it has already overwritten)
+        pae_matrix = pae_matrix + pae_matrix.T
+        pae_matrix *= 0.5
     
     # Save as NPZ
     try:
@@ -186,14 +257,19 @@ def convert_protenix_to_ipsae(json_path, output_path, verbose=True):
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Save with the key that ipSAE expects
-        np.savez_compressed(
-            output_path, 
-            predicted_aligned_error=pae_matrix
-        )
+        if mmap_friendly:
+            output_path = output_path.with_suffix('.npy')
+            np.save(output_path, np.ascontiguousarray(pae_matrix))
+        else:
+            # Save with the key that ipSAE expects
+            save_npz = np.savez_compressed if compression == 'zlib' else np.savez
+            save_npz(
+                output_path, 
+                predicted_aligned_error=pae_matrix
+            )
         
         if verbose:
-            print(f"\n✓ Successfully saved NPZ file")
+            print(f"\n✓ Successfully saved {'NPY' if mmap_friendly else 'NPZ'} file")
             print(f"  Location: {output_path}")
             print(f"  Size: {output_path.stat().st_size / 1024:.1f} KB")
             print()
@@ -206,6 +282,56 @@ def convert_protenix_to_ipsae(json_path, output_path, verbose=True):
         sys.exit(1)
 
 
+def _convert_batch_item(task):
+    # Pool worker: convert one file, reporting failure instead of exiting
+    # (convert_protenix_to_ipsae calls sys.exit on errors)
+    json_path, output_path, compression, symmetrize, mmap_friendly = task
+    try:
+        convert_protenix_to_ipsae(json_path, output_path, verbose=False,
+                                  compression=compression, symmetrize=symmetrize,
+                                  mmap_friendly=mmap_friendly)
+        return json_path, True
+    except (SystemExit, Exception) as e:
+        print(f"ERROR: Could not convert {json_path}: {type(e).__name__}: {e}", file=sys.stderr)
+        return json_path, False
+
+
+def convert_directory(input_dir, output_dir, processes=None, compression='zlib', symmetrize=False,
+                      mmap_friendly=False):
+    """
+    Convert every Protenix confidence JSON in a directory, in parallel.
+    
+    One interpreter start-up is shared by all files, and the JSON parsing
+    is spread over a pool of worker processes.
+    
+    Args:
+        input_dir: Directory containing *_confidence*.json files
+        output_dir: Directory for the NPZ files ({json stem}.npz)
+        processes: Number of worker processes (default: all CPUs)
+        compression: NPZ compression, as for convert_protenix_to_ipsae
+        symmetrize: Symmetrize PAE matrices, as for convert_protenix_to_ipsae
+        mmap_friendly: Write .npy files, as for convert_protenix_to_ipsae
+    
+    Returns:
+        list of input JSON paths that failed to convert
+    """
+    json_paths = sorted(Path(input_dir).glob('*_confidence*.json'))
+    output_dir = Path(output_dir)
+    tasks = [
+        (str(json_path), str(output_dir / f"{json_path.stem}.npz"), compression, symmetrize, mmap_friendly)
+        for json_path in json_paths
+    ]
+    
+    if not tasks:
+        print(f"ERROR: no confidence JSON files found in {input_dir}")
+        sys.exit(1)
+    
+    with Pool(processes=processes) as pool:
+        results = pool.map(_convert_batch_item, tasks)
+    
+    return [json_path for json_path, ok in results if not ok]
+
+
 def main():
     """Command-line interface"""
     parser = argparse.ArgumentParser(
@@ -218,6 +344,18 @@ Examples:
   
   # Quiet mode
   python convert_protenix_to_npz.py confidence.json output.npz --quiet
+  
+  # Average the PAE matrix with its transpose
+  python convert_protenix_to_npz.py confidence.json output.npz --symmetrize
+  
+  # Convert every *_confidence*.json in a directory using all CPUs
+  python convert_protenix_to_npz.py --batch protenix_dir/ npz_dir/
+  
+  # Memory-mappable .npy output (output.npy)
+  python convert_protenix_to_npz.py confidence.json output.npz --mmap-friendly
+  
+  # Uncompressed NPZ (faster to write, larger on disk)
+  python convert_protenix_to_npz.py confidence.json output.npz --compression none
 
 Notes:
   - Input must be a valid JSON file from Protenix prediction
@@ -229,13 +367,13 @@ Notes:
     parser.add_argument(
         'input_json',
         type=str,
-        help='Input Protenix confidence JSON file'
+        help='Input Protenix confidence JSON file (input directory with --batch)'
     )
     
     parser.add_argument(
         'output_npz',
         type=str,
-        help='Output NPZ file path'
+        help='Output NPZ file path (output directory with --batch)'
     )
     
     parser.add_argument(
@@ -244,6 +382,38 @@ Notes:
         help='Suppress progress messages'
     )
     
+    parser.add_argument(
+        '--compression',
+        choices=['zlib', 'none'],
+        default='zlib',
+        help='NPZ compression: zlib (default) or none for faster writes'
+    )
+    
+    parser.add_argument(
+        '--symmetrize',
+        action='store_true',
+        help='Average the PAE matrix with its transpose before saving'
+    )
+    
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Convert all *_confidence*.json files in the input directory in parallel'
+    )
+    
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=None,
+        help='Worker processes for --batch (default: all CPUs)'
+    )
+    
+    parser.add_argument(
+        '--mmap-friendly',
+        action='store_true',
+        help='Write an uncompressed .npy file that can be memory-mapped instead of an NPZ'
+    )
+    
     parser.add_argument(
         '-v', '--version',
         action='version',
@@ -252,11 +422,32 @@ Notes:
     
     args = parser.parse_args()
     
+    if args.batch:
+        failed = convert_directory(
+            args.input_json,
+            args.output_npz,
+            processes=args.processes,
+            compression=args.compression,
+            symmetrize=args.symmetrize,
+            mmap_friendly=args.mmap_friendly
+        )
+        if failed:
+            print(f"ERROR: Failed to convert {len(failed)} file(s):")
+            for json_path in failed:
+                print(f"  {json_path}")
+            sys.exit(1)
+        if not args.quiet:
+            print(f"✓ Converted all files from {args.input_json} to {args.output_npz}")
+        return
+    
     # Run conversion
     convert_protenix_to_ipsae(
         args.input_json, 
         args.output_npz,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        compression=args.compression,
+        symmetrize=args.symmetrize,
+        mmap_friendly=args.mmap_friendly
     )
 
 
@@ -7,8 +7,239 @@ This script extracts sequences from all chains and outputs them for use in Prote
 """
 
 import argparse
+import io
+import mmap
+import os
+import re
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr
+from itertools import repeat
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+
+
+# Three-letter residue names and their one-letter codes. Read-only, since
+# RESIDUE_TABLE is built from it once at import.
+RESIDUE_CODES = MappingProxyType({
+    'ALA': 'A', 'CYS': 'C', 'ASP': 'D', 'GLU': 'E',
+    'PHE': 'F', 'GLY': 'G', 'HIS': 'H', 'ILE': 'I',
+    'LYS': 'K', 'LEU': 'L', 'MET': 'M', 'ASN': 'N',
+    'PRO': 'P', 'GLN': 'Q', 'ARG': 'R', 'SER': 'S',
+    'THR': 'T', 'VAL': 'V', 'TRP': 'W', 'TYR': 'Y',
+    'UNK': 'X'
+})
+
+
+# A three-letter name is packed into a 24-bit integer, one byte per letter,
+# and hashed to one of 2**RESIDUE_HASH_BITS table slots (multiplicative
+# hashing in uint32 arithmetic)
+RESIDUE_HASH_BITS = 16
+RESIDUE_HASH_MULTIPLIER = np.uint32(2654435761)
+UNKNOWN_CODE = np.uint8(ord('X'))
+
+
+def residue_slots(packed):
+    """Hash packed residue names (uint32 array) to their table slots."""
+    return (packed * RESIDUE_HASH_MULTIPLIER) >> np.uint32(32 - RESIDUE_HASH_BITS)
+
+
+def build_residue_table():
+    """
+    Build a hashed lookup table from packed residue names to one-letter codes.
+    
+    Each slot holds the packed name it was filled with, so lookups can tell
+    a known residue from any other name hashing to the same slot.
+    
+    Returns:
+        tuple: (uint32 array of packed names, uint8 array of one-letter codes),
+        2**RESIDUE_HASH_BITS entries each; empty slots hold a key no packed
+        name can take
+    """
+    keys = np.full(1 << RESIDUE_HASH_BITS, 0xFFFFFFFF, dtype=np.uint32)
+    codes = np.full(1 << RESIDUE_HASH_BITS, UNKNOWN_CODE, dtype=np.uint8)
+    packed = np.array([int.from_bytes(name.encode(), 'big') for name in RESIDUE_CODES], dtype=np.uint32)
+    slots = residue_slots(packed)
+    if len(np.unique(slots)) != len(slots):
+        raise ValueError("Residue names collide in the residue table")
+    keys[slots] = packed
+    codes[slots] = [ord(code) for code in RESIDUE_CODES.values()]
+    return keys, codes
+
+
+RESIDUE_KEYS, RESIDUE_TABLE = build_residue_table()
+
+
+def lookup_residues(packed):
+    """
+    Translate packed residue names (uint32 array) to one-letter codes.
+    
+    Returns:
+        np.ndarray: uint8 one-letter codes, X for unknown names
+    """
+    slots = residue_slots(packed)
+    return np.where(RESIDUE_KEYS[slots] == packed, RESIDUE_TABLE[slots], UNKNOWN_CODE)
+
+# ASCII whitespace as split by bytes.split()
+IS_WHITESPACE = np.zeros(256, dtype=bool)
+IS_WHITESPACE[list(b' \t\n\v\f\r')] = True
+
+# Scratch buffers reused by translate_residues, one per thread. A buffer is
+# replaced (never resized in place, which fails while a NumPy view of it is
+# alive) when a chain does not fit, and chains larger than SCRATCH_MAX_SIZE
+# get a buffer of their own that is not kept.
+SCRATCH_MIN_SIZE = 1 << 16
+SCRATCH_MAX_SIZE = 1 << 22
+_scratch = threading.local()
+
+
+def scratch_buffer(size):
+    """Return a scratch bytearray of at least size bytes for the calling thread."""
+    buffer = getattr(_scratch, 'buffer', None)
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(max(size, SCRATCH_MIN_SIZE))
+        if size <= SCRATCH_MAX_SIZE:
+            _scratch.buffer = buffer
+    return buffer
+
+
+def translate_residues(names):
+    """
+    Translate three-letter residue names to a one-letter sequence.
+    
+    The names are split and translated by NumPy over the whole buffer: token
+    boundaries come from a whitespace mask, and all names are packed and
+    looked up in the residue table with a single gather.
+    
+    Args:
+        names: bytes or bytearray of whitespace-separated residue names
+    
+    Returns:
+        bytes: one-letter sequence, with X for unknown residues
+    """
+    # Copy into the scratch buffer padded with whitespace, so every name has
+    # both boundaries and its first three bytes can always be read
+    size = len(names) + 4
+    buffer = scratch_buffer(size)
+    buffer[0] = 32
+    buffer[1:size - 3] = names
+    buffer[size - 3:size] = b'   '
+    data = np.frombuffer(buffer, dtype=np.uint8, count=size)
+    space = IS_WHITESPACE[data]
+    edges = np.flatnonzero(space[:-1] != space[1:]) + 1
+    starts, ends = edges[0::2], edges[1::2]
+    
+    packed = (data[starts].astype(np.uint32) << 16) | (data[starts + 1].astype(np.uint32) << 8) | data[starts + 2]
+    codes = lookup_residues(packed)
+    codes[ends - starts != 3] = ord('X')
+    return codes.tobytes()
+
+
+def line_pattern(prefix):
+    """
+    Compile patterns for lines starting with prefix after leading whitespace.
+    
+    Returns:
+        tuple: (pattern matching from the newline before such a line, pattern
+        matching such a line at the current position). The first lets
+        search_line skip ahead with a fast literal scan for newlines.
+    """
+    return re.compile(rb'\n[^\S\n]*' + prefix), re.compile(rb'[^\S\n]*' + prefix)
+
+
+def search_line(patterns, data, pos, endpos):
+    """
+    Find the first line in data[pos:endpos] matching patterns from line_pattern.
+    
+    Args:
+        pos: offset of a line start
+    
+    Returns:
+        int: offset of the start of the matching line, or None
+    """
+    in_text, at_start = patterns
+    if pos == 0 and at_start.match(data, 0, endpos):
+        return 0
+    match = in_text.search(data, max(pos - 1, 0), endpos)
+    return match.start() + 1 if match else None
+
+
+# mmCIF lines the sequence parser acts on
+CIF_STRUCT_ASYM_HEADER = line_pattern(rb'_struct_asym\.')
+CIF_ENTITY_POLY_SEQ_HEADER = line_pattern(rb'_entity_poly_seq\.')
+CIF_ENTITY_POLY_SEQ_END = line_pattern(rb'(?:_(?!entity_poly_seq\.)|#|loop_)')
+
+# Data rows with at least three values: the first and third of an
+# _entity_poly_seq row (entity ID, residue), the first and second of a
+# _struct_asym row (chain ID, entity ID)
+CIF_ROW = re.compile(rb'^[^\S\n]*([^\s_#]\S*)[^\S\n]+\S+[^\S\n]+(\S+)', re.M)
+CIF_MAPPING_ROW = re.compile(rb'^[^\S\n]*([^\s_#]\S*)[^\S\n]+(\S+)[^\S\n]+\S', re.M)
+
+
+# SEQRES residue fields hold 13 right-justified names in 4-byte columns
+SEQRES_COLUMNS = 13
+SEQRES_FIELD_WIDTH = 4 * SEQRES_COLUMNS
+
+
+def translate_seqres(fields):
+    """
+    Translate the residue fields of a chain's SEQRES records.
+    
+    The fields are laid out as a (records x 13 x 4) byte array and the names
+    are gathered directly from their fixed columns, so no token boundaries
+    have to be searched for. Fields that do not follow the fixed layout are
+    translated with translate_residues instead.
+    
+    Args:
+        fields: list of SEQRES residue fields (record bytes from column 20)
+    
+    Returns:
+        bytes: one-letter sequence, with X for unknown residues
+    """
+    # One NUL-padded row per record
+    width = max(SEQRES_FIELD_WIDTH, max(map(len, fields)))
+    data = np.array(fields, dtype=f'S{width}').view(np.uint8).reshape(len(fields), width)
+    
+    # With only printable names, spaces, padding and a trailing carriage
+    # return, every byte up to a space is blank
+    if ((data < 32) & (data != 0) & (data != 13)).any():
+        return translate_residues(b' '.join(fields))
+    blank = data <= 32
+    
+    # Each name must be right-justified in its column, separated by a blank
+    # and followed only by blanks
+    columns = blank[:, :SEQRES_FIELD_WIDTH].reshape(len(fields), SEQRES_COLUMNS, 4)
+    misaligned = (~columns[:, :, 0] & (columns[:, :, 1] | columns[:, :, 2])) | (~columns[:, :, 1] & columns[:, :, 2])
+    if misaligned.any() or not columns[:, :, 3].all() or not blank[:, SEQRES_FIELD_WIDTH:].all():
+        return translate_residues(b' '.join(fields))
+    
+    # Blank columns (after the last residue) are dropped; names shorter than
+    # three letters keep their leading spaces and translate to X
+    names = data[:, :SEQRES_FIELD_WIDTH].reshape(len(fields), SEQRES_COLUMNS, 4)[~columns[:, :, 2]]
+    packed = (names[:, 0].astype(np.uint32) << 16) | (names[:, 1].astype(np.uint32) << 8) | names[:, 2]
+    return lookup_residues(packed).tobytes()
+
+
+# SEQRES records of a PDB file, matched directly in the mapped file: the
+# chain ID in column 12 (unset when blank) and the residue field from column 20
+SEQRES_RECORD = re.compile(rb'^SEQRES.{0,5}(?:(\S)|[^\S\n])?.{0,7}(.*)$', re.M)
+
+
+def map_file(path):
+    """
+    Memory-map a file for reading.
+    
+    Returns:
+        read-only mmap of the file, or None if the file is empty (empty files
+        cannot be mapped)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 
 def parse_cif_sequences(cif_file):
@@ -16,72 +247,59 @@ def parse_cif_sequences(cif_file):
     Parse sequences from mmCIF file.
     
     Returns:
-        dict: {chain_id: sequence}
+        dict: {chain_id: sequence}, with sequences as ASCII bytes
     """
     sequences = {}
     current_entity = None
     current_sequence = []
     
     try:
-        with open(cif_file, 'r') as f:
-            in_entity_poly = False
-            in_entity_poly_seq = False
-            entity_to_chain = {}
+        mm = map_file(cif_file)
+        if mm is None:
+            return {}
+        
+        # The file is scanned with compiled patterns instead of line by line;
+        # only chain and entity IDs are decoded
+        with mm:
+            # Everything after the first _struct_asym. line is read as
+            # entity to chain mapping rows, so sequences only come from the
+            # part of the file before it
+            sequence_end = search_line(CIF_STRUCT_ASYM_HEADER, mm, 0, len(mm))
+            if sequence_end is None:
+                sequence_end = mapping_start = len(mm)
+            else:
+                mapping_start = mm.find(b'\n', sequence_end) + 1 or len(mm)
             
-            for line in f:
-                line = line.strip()
+            # Parse sequences: each _entity_poly_seq. header starts rows that
+            # run until the next other category, comment or loop_ line
+            pos = 0
+            while (header := search_line(CIF_ENTITY_POLY_SEQ_HEADER, mm, pos, sequence_end)) is not None:
+                body_start = mm.find(b'\n', header, sequence_end) + 1 or sequence_end
+                end = search_line(CIF_ENTITY_POLY_SEQ_END, mm, body_start, sequence_end)
+                pos = sequence_end if end is None else end
                 
-                # Parse entity to chain mapping
-                if line.startswith('_struct_asym.'):
-                    in_entity_poly = True
-                    continue
-                
-                if in_entity_poly and line and not line.startswith('_') and not line.startswith('#'):
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        # Format: chain_id entity_id details
-                        chain_id = parts[0]
-                        entity_id = parts[1]
-                        entity_to_chain[entity_id] = chain_id
-                    continue
-                
-                # Parse sequences
-                if line.startswith('_entity_poly_seq.'):
-                    in_entity_poly_seq = True
-                    continue
-                
-                if in_entity_poly_seq:
-                    if line.startswith('_') or line.startswith('#') or line.startswith('loop_'):
-                        in_entity_poly_seq = False
-                        continue
+                for entity_id, residue in CIF_ROW.findall(mm, body_start, pos):
+                    if entity_id not in sequences:
+                        sequences[entity_id] = bytearray()
                     
-                    if line:
-                        parts = line.split()
-                        if len(parts) >= 3:
-                            entity_id = parts[0]
-                            residue = parts[2]  # 3-letter code
-                            
-                            # Convert 3-letter to 1-letter
-                            aa_map = {
-                                'ALA': 'A', 'CYS': 'C', 'ASP': 'D', 'GLU': 'E',
-                                'PHE': 'F', 'GLY': 'G', 'HIS': 'H', 'ILE': 'I',
-                                'LYS': 'K', 'LEU': 'L', 'MET': 'M', 'ASN': 'N',
-                                'PRO': 'P', 'GLN': 'Q', 'ARG': 'R', 'SER': 'S',
-                                'THR': 'T', 'VAL': 'V', 'TRP': 'W', 'TYR': 'Y',
-                                'UNK': 'X'
-                            }
-                            
-                            if entity_id not in sequences:
-                                sequences[entity_id] = []
-                            
-                            single_letter = aa_map.get(residue, 'X')
-                            sequences[entity_id].append(single_letter)
+                    # Residue names are accumulated space-separated in one
+                    # buffer per entity
+                    seq_buffer = sequences[entity_id]
+                    seq_buffer += residue
+                    seq_buffer.append(32)
             
-            # Convert to chain IDs and join sequences
+            # Parse entity to chain mapping (format: chain_id entity_id
+            # details); later rows override earlier ones
+            entity_to_chain = {
+                entity_id: chain_id
+                for chain_id, entity_id in CIF_MAPPING_ROW.findall(mm, mapping_start)
+            }
+            
+            # Convert to chain IDs and translate sequences to 1-letter codes
             chain_sequences = {}
-            for entity_id, seq_list in sequences.items():
-                chain_id = entity_to_chain.get(entity_id, entity_id)
-                chain_sequences[chain_id] = ''.join(seq_list)
+            for entity_id, seq_buffer in sequences.items():
+                chain_id = entity_to_chain.get(entity_id, entity_id).decode()
+                chain_sequences[chain_id] = translate_residues(seq_buffer)
             
             return chain_sequences
             
@@ -95,36 +313,26 @@ def parse_pdb_sequences(pdb_file):
     Parse sequences from PDB file using SEQRES records.
     
     Returns:
-        dict: {chain_id: sequence}
+        dict: {chain_id: sequence}, with sequences as ASCII bytes
     """
     sequences = {}
     
-    aa_map = {
-        'ALA': 'A', 'CYS': 'C', 'ASP': 'D', 'GLU': 'E',
-        'PHE': 'F', 'GLY': 'G', 'HIS': 'H', 'ILE': 'I',
-        'LYS': 'K', 'LEU': 'L', 'MET': 'M', 'ASN': 'N',
-        'PRO': 'P', 'GLN': 'Q', 'ARG': 'R', 'SER': 'S',
-        'THR': 'T', 'VAL': 'V', 'TRP': 'W', 'TYR': 'Y',
-        'UNK': 'X'
-    }
-    
     try:
-        with open(pdb_file, 'r') as f:
-            for line in f:
-                if line.startswith('SEQRES'):
-                    chain_id = line[11:12].strip()
-                    residues = line[19:].split()
-                    
-                    if chain_id not in sequences:
-                        sequences[chain_id] = []
-                    
-                    for res in residues:
-                        single_letter = aa_map.get(res, 'X')
-                        sequences[chain_id].append(single_letter)
+        mm = map_file(pdb_file)
+        if mm is None:
+            return {}
+        
+        # Group residue fields by chain; they are translated per chain
+        fields = {}
+        with mm:
+            for chain_id, field in SEQRES_RECORD.findall(mm):
+                if chain_id not in fields:
+                    fields[chain_id] = []
+                fields[chain_id].append(field)
         
-        # Join sequences
-        for chain_id in sequences:
-            sequences[chain_id] = ''.join(sequences[chain_id])
+        # Translate sequences to 1-letter codes
+        for chain_id, chain_fields in fields.items():
+            sequences[chain_id.decode()] = translate_seqres(chain_fields)
         
         return sequences
         
@@ -133,6 +341,14 @@ def parse_pdb_sequences(pdb_file):
         return {}
 
 
+# Sequence parser for each supported structure file extension
+PARSERS = {
+    '.cif': parse_cif_sequences,
+    '.pdb': parse_pdb_sequences,
+    '.ent': parse_pdb_sequences
+}
+
+
 def identify_target_chain(sequences, designed_chain=None):
     """
     Identify the target chain (usually the longest chain, or not the designed binder).
@@ -147,28 +363,161 @@ def identify_target_chain(sequences, designed_chain=None):
     if not sequences:
         return None, None
     
+    # Common minibinder case: binder plus target, so the target is simply
+    # the other chain
+    if designed_chain and len(sequences) == 2 and designed_chain in sequences:
+        for chain_id, sequence in sequences.items():
+            if chain_id != designed_chain:
+                return chain_id, sequence
+    
     # If designed chain is specified, exclude it
-    if designed_chain and designed_chain in sequences:
-        candidates = {k: v for k, v in sequences.items() if k != designed_chain}
-        if not candidates:
-            print(f"Warning: Only designed chain {designed_chain} found", file=sys.stderr)
-            candidates = sequences
-    else:
-        candidates = sequences
-    
-    # Return the longest sequence (typically the target)
-    target_chain = max(candidates.items(), key=lambda x: len(x[1]))
+    excluded = designed_chain if designed_chain and designed_chain in sequences else None
+    
+    # Find the longest sequence (typically the target) in a single pass; the
+    # first of equally long chains wins
+    target_chain = None
+    best_length = -1
+    for chain_id, sequence in sequences.items():
+        if chain_id == excluded:
+            continue
+        length = len(sequence)
+        if length > best_length:
+            best_length = length
+            target_chain = (chain_id, sequence)
+    
+    if target_chain is None:
+        print(f"Warning: Only designed chain {designed_chain} found", file=sys.stderr)
+        target_chain = (designed_chain, sequences[designed_chain])
+    
     return target_chain
 
 
+def load_sequences(structure_file):
+    """
+    Parse the chain sequences of a structure file.
+    
+    Args:
+        structure_file: path to a CIF or PDB file
+    
+    Returns:
+        dict: {chain_id: sequence} with sequences as ASCII bytes, or None if
+        the file is missing, has an unsupported format or contains no
+        sequences (an error is printed)
+    """
+    # Determine file type
+    structure_path = Path(structure_file)
+    if not structure_path.exists():
+        print(f"Error: File not found: {structure_file}", file=sys.stderr)
+        return None
+    
+    suffix = structure_path.suffix.lower()
+    
+    # Parse sequences
+    parse_sequences = PARSERS.get(suffix)
+    if parse_sequences is None:
+        print(f"Error: Unsupported file format: {suffix}", file=sys.stderr)
+        print(f"Supported formats: {', '.join(PARSERS)}", file=sys.stderr)
+        return None
+    sequences = parse_sequences(structure_file)
+    
+    if not sequences:
+        print("Error: No sequences found in structure file", file=sys.stderr)
+        return None
+    
+    return sequences
+
+
+def write_sequences(structure_path, sequences, output_file, all_chains=False,
+                    designed_chain=None, output_format='fasta'):
+    """
+    Write the target chain, or all chains, of a structure.
+    
+    Args:
+        structure_path: Path of the structure file, used in FASTA headers
+        sequences: dict of {chain_id: sequence}, sequences as bytes
+        output_file: open binary file to write to
+        all_chains: write all chains instead of only the target
+        designed_chain: optional chain ID of the designed binder to exclude
+        output_format: 'fasta' or 'plain'
+    
+    Returns:
+        bool: False if the target chain could not be identified
+    """
+    if all_chains:
+        # Output all chains
+        for chain_id, sequence in sequences.items():
+            if output_format == 'fasta':
+                output_file.write(f">{structure_path.stem}_chain_{chain_id}\n".encode())
+            output_file.write(sequence + b'\n')
+        return True
+    
+    # Output only target chain
+    target_chain_id, target_sequence = identify_target_chain(
+        sequences,
+        designed_chain=designed_chain
+    )
+    
+    if not target_sequence:
+        print("Error: Could not identify target chain", file=sys.stderr)
+        return False
+    
+    # Sequences are written as the bytes they were translated to, without
+    # decoding
+    if output_format == 'fasta':
+        output_file.write(f">{structure_path.stem}_target_chain_{target_chain_id}\n".encode())
+    output_file.write(target_sequence + b'\n')
+    
+    # Print summary to stderr
+    print(f"Extracted target chain {target_chain_id} ({len(target_sequence)} residues)", 
+          file=sys.stderr)
+    print(f"Total chains in structure: {len(sequences)}", file=sys.stderr)
+    return True
+
+
+def process_structure(structure_file, output_options):
+    """
+    Extract the sequences of one structure file in batch mode.
+    
+    Output and messages are collected and returned rather than written, so
+    results from worker processes are written in input order.
+    
+    Args:
+        structure_file: path to a CIF or PDB file
+        output_options: keyword arguments for write_sequences
+    
+    Returns:
+        tuple: (success, output bytes, messages printed to stderr)
+    """
+    output = io.BytesIO()
+    messages = io.StringIO()
+    with redirect_stderr(messages):
+        sequences = load_sequences(structure_file)
+        success = sequences is not None and write_sequences(
+            Path(structure_file), sequences, output, **output_options
+        )
+    return success, output.getvalue(), messages.getvalue()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Extract target protein sequence from structure file'
     )
     parser.add_argument(
         'structure_file',
+        nargs='?',
         help='Input CIF or PDB file'
     )
+    parser.add_argument(
+        '--input-list',
+        help='File listing one structure file per line; all of them are '
+             'processed in this run and written to the same output'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Worker processes used to parse structures with --input-list (default: 1)'
+    )
     parser.add_argument(
         '--output',
         '-o',
@@ -192,63 +541,61 @@ def main():
     
     args = parser.parse_args()
     
-    # Determine file type
-    structure_path = Path(args.structure_file)
-    if not structure_path.exists():
-        print(f"Error: File not found: {args.structure_file}", file=sys.stderr)
-        sys.exit(1)
+    if (args.structure_file is None) == (args.input_list is None):
+        parser.error('provide either a structure file or --input-list')
     
-    suffix = structure_path.suffix.lower()
+    output_options = dict(
+        all_chains=args.all_chains,
+        designed_chain=args.designed_chain,
+        output_format=args.format
+    )
     
-    # Parse sequences
-    if suffix == '.cif':
-        sequences = parse_cif_sequences(args.structure_file)
-    elif suffix in ['.pdb', '.ent']:
-        sequences = parse_pdb_sequences(args.structure_file)
-    else:
-        print(f"Error: Unsupported file format: {suffix}", file=sys.stderr)
-        print("Supported formats: .cif, .pdb, .ent", file=sys.stderr)
-        sys.exit(1)
+    if args.input_list:
+        # Batch mode: one process for every listed structure, so interpreter
+        # startup and imports are paid once
+        with open(args.input_list) as f:
+            structure_files = [line.strip() for line in f if line.strip()]
+        
+        output_file = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        failures = 0
+        pool = None
+        try:
+            # Structures are independent, so they can be parsed in parallel;
+            # results are still written in input order
+            if args.processes > 1:
+                pool = ProcessPoolExecutor(max_workers=args.processes)
+                results = pool.map(process_structure, structure_files, repeat(output_options), chunksize=8)
+            else:
+                results = map(process_structure, structure_files, repeat(output_options))
+            
+            for success, output, messages in results:
+                output_file.write(output)
+                sys.stderr.write(messages)
+                if not success:
+                    failures += 1
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if args.output:
+                output_file.close()
+        
+        if failures:
+            print(f"Error: {failures} of {len(structure_files)} structure files failed", file=sys.stderr)
+            sys.exit(1)
+        return
     
-    if not sequences:
-        print("Error: No sequences found in structure file", file=sys.stderr)
+    sequences = load_sequences(args.structure_file)
+    if sequences is None:
         sys.exit(1)
     
     # Prepare output
-    output_file = sys.stdout
+    output_file = sys.stdout.buffer
     if args.output:
-        output_file = open(args.output, 'w')
+        output_file = open(args.output, 'wb')
     
     try:
-        if args.all_chains:
-            # Output all chains
-            for chain_id, sequence in sequences.items():
-                if args.format == 'fasta':
-                    output_file.write(f">{structure_path.stem}_chain_{chain_id}\n")
-                    output_file.write(f"{sequence}\n")
-                else:
-                    output_file.write(f"{sequence}\n")
-        else:
-            # Output only target chain
-            target_chain_id, target_sequence = identify_target_chain(
-                sequences,
-                designed_chain=args.designed_chain
-            )
-            
-            if target_sequence:
-                if args.format == 'fasta':
-                    output_file.write(f">{structure_path.stem}_target_chain_{target_chain_id}\n")
-                    output_file.write(f"{target_sequence}\n")
-                else:
-                    output_file.write(f"{target_sequence}\n")
-                
-                # Print summary to stderr
-                print(f"Extracted target chain {target_chain_id} ({len(target_sequence)} residues)", 
-                      file=sys.stderr)
-                print(f"Total chains in structure: {len(sequences)}", file=sys.stderr)
-            else:
-                print("Error: Could not identify target chain", file=sys.stderr)
-                sys.exit(1)
+        if not write_sequences(Path(args.structure_file), sequences, output_file, **output_options):
+            sys.exit(1)
     
     finally:
         if args.output:
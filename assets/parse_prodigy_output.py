@@ -21,112 +21,119 @@ PRODIGY output format example:
 
 import argparse
 import re
-import csv
 import sys
+from functools import partial
+
+
+# One pattern for every PRODIGY metric, so the output is scanned in a single
+# pass; each capture group is named after the metric it holds. The pattern is
+# UTF-8 encoded to match the raw bytes of the file, and never spans lines so
+# the file can be scanned a block of lines at a time.
+PRODIGY_PATTERN = re.compile((
+    r'Buried Surface Area:[ \t]+(?P<buried_surface_area>[\d.]+)[ \t]+A'
+    r'|Number of interface contacts \(ICs\):[ \t]+(?P<num_interface_contacts>\d+)'
+    r'|Number of non-interacting surface residues:[ \t]+(?P<num_noninteracting_surface>\d+)'
+    r'|Number of charged residues in ICs:[ \t]+(?P<num_charged_residues>\d+)'
+    r'|Percentage of charged residues in ICs:[ \t]+(?P<percent_charged_residues>[\d.]+)%'
+    r'|Number of apolar residues in ICs:[ \t]+(?P<num_apolar_residues>\d+)'
+    r'|Percentage of apolar residues in ICs:[ \t]+(?P<percent_apolar_residues>[\d.]+)%'
+    r'|Predicted binding affinity \(ΔG\):[ \t]+(?P<predicted_binding_affinity>[-\d.]+)[ \t]+kcal/mol'
+    r'|Predicted dissociation constant \(Kd\):[ \t]+(?P<predicted_kd>[\d.e+-]+)[ \t]+M[ \t]+at[ \t]+(?P<kd_temperature>[\d.]+)'
+).encode())
+
+# Type of each metric
+METRIC_TYPES = {
+    'buried_surface_area': float,
+    'num_interface_contacts': int,
+    'num_noninteracting_surface': int,
+    'num_charged_residues': int,
+    'percent_charged_residues': float,
+    'num_apolar_residues': int,
+    'percent_apolar_residues': float,
+    'predicted_binding_affinity': float,
+    'predicted_kd': float,
+    'kd_temperature': float
+}
+
+# Metrics filled by a match, keyed by the last group of its alternative
+MATCH_METRICS = {key: (key,) for key in METRIC_TYPES}
+MATCH_METRICS['kd_temperature'] = ('predicted_kd', 'kd_temperature')
+
+# CSV summary columns and the metrics they hold
+CSV_COLUMNS = [
+    ('buried_surface_area_A2', 'buried_surface_area'),
+    ('num_interface_contacts', 'num_interface_contacts'),
+    ('num_noninteracting_surface', 'num_noninteracting_surface'),
+    ('num_charged_residues', 'num_charged_residues'),
+    ('percent_charged_residues', 'percent_charged_residues'),
+    ('num_apolar_residues', 'num_apolar_residues'),
+    ('percent_apolar_residues', 'percent_apolar_residues'),
+    ('predicted_binding_affinity_kcal_mol', 'predicted_binding_affinity'),
+    ('predicted_kd_M', 'predicted_kd'),
+    ('kd_temperature_C', 'kd_temperature')
+]
+CSV_METRICS = [key for _, key in CSV_COLUMNS]
+CSV_HEADER = ','.join(['structure_id'] + [column for column, _ in CSV_COLUMNS]).encode() + b'\r\n'
+
+# Size of the blocks the PRODIGY output is read in
+READ_BLOCK_SIZE = 1 << 20
+
+
+def collect_metrics(metrics, data, endpos):
+    """Fill metrics that are still unset from the PRODIGY lines in data[:endpos]."""
+    
+    # Keep the first value found for each metric
+    for match in PRODIGY_PATTERN.finditer(data, 0, endpos):
+        for key in MATCH_METRICS[match.lastgroup]:
+            if metrics[key] is None:
+                metrics[key] = METRIC_TYPES[key](match.group(key))
 
 
 def parse_prodigy_output(input_file):
     """Parse PRODIGY output file and extract key metrics."""
     
-    metrics = {
-        'buried_surface_area': None,
-        'num_interface_contacts': None,
-        'num_noninteracting_surface': None,
-        'num_charged_residues': None,
-        'percent_charged_residues': None,
-        'num_apolar_residues': None,
-        'percent_apolar_residues': None,
-        'predicted_binding_affinity': None,
-        'predicted_kd': None,
-        'kd_temperature': None
-    }
-    
-    with open(input_file, 'r') as f:
-        content = f.read()
-    
-    # Extract buried surface area
-    bsa_match = re.search(r'Buried Surface Area:\s+([\d.]+)\s+A', content)
-    if bsa_match:
-        metrics['buried_surface_area'] = float(bsa_match.group(1))
-    
-    # Extract number of interface contacts
-    ic_match = re.search(r'Number of interface contacts \(ICs\):\s+(\d+)', content)
-    if ic_match:
-        metrics['num_interface_contacts'] = int(ic_match.group(1))
-    
-    # Extract non-interacting surface residues
-    nis_match = re.search(r'Number of non-interacting surface residues:\s+(\d+)', content)
-    if nis_match:
-        metrics['num_noninteracting_surface'] = int(nis_match.group(1))
-    
-    # Extract charged residues
-    charged_match = re.search(r'Number of charged residues in ICs:\s+(\d+)', content)
-    if charged_match:
-        metrics['num_charged_residues'] = int(charged_match.group(1))
-    
-    charged_pct_match = re.search(r'Percentage of charged residues in ICs:\s+([\d.]+)%', content)
-    if charged_pct_match:
-        metrics['percent_charged_residues'] = float(charged_pct_match.group(1))
-    
-    # Extract apolar residues
-    apolar_match = re.search(r'Number of apolar residues in ICs:\s+(\d+)', content)
-    if apolar_match:
-        metrics['num_apolar_residues'] = int(apolar_match.group(1))
-    
-    apolar_pct_match = re.search(r'Percentage of apolar residues in ICs:\s+([\d.]+)%', content)
-    if apolar_pct_match:
-        metrics['percent_apolar_residues'] = float(apolar_pct_match.group(1))
-    
-    # Extract predicted binding affinity (ΔG)
-    dg_match = re.search(r'Predicted binding affinity \(ΔG\):\s+([-\d.]+)\s+kcal/mol', content)
-    if dg_match:
-        metrics['predicted_binding_affinity'] = float(dg_match.group(1))
-    
-    # Extract predicted Kd
-    kd_match = re.search(r'Predicted dissociation constant \(Kd\):\s+([\d.e+-]+)\s+M\s+at\s+([\d.]+)', content)
-    if kd_match:
-        metrics['predicted_kd'] = float(kd_match.group(1))
-        metrics['kd_temperature'] = float(kd_match.group(2))
+    metrics = dict.fromkeys(METRIC_TYPES)
+    
+    # Stream the file as bytes, scanning only complete lines of each block
+    # and carrying a partial last line over to the next one. int() and float()
+    # parse the matched bytes directly, so the file is never decoded.
+    with open(input_file, 'rb') as f:
+        pending = b''
+        for block in iter(partial(f.read, READ_BLOCK_SIZE), b''):
+            data = pending + block
+            end = data.rfind(b'\n') + 1
+            collect_metrics(metrics, data, end)
+            pending = data[end:]
+            
+            # Stop reading once every metric has been found
+            if None not in metrics.values():
+                return metrics
+        
+        collect_metrics(metrics, pending, len(pending))
     
     return metrics
 
 
+def format_csv_field(value):
+    """Format a value as a CSV field, quoting it only where csv.writer would."""
+    
+    if value is None:
+        return ''
+    text = str(value)
+    if ',' in text or '"' in text or '\r' in text or '\n' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
 def write_csv_summary(metrics, structure_id, output_file):
     """Write metrics to CSV file."""
     
-    fieldnames = [
-        'structure_id',
-        'buried_surface_area_A2',
-        'num_interface_contacts',
-        'num_noninteracting_surface',
-        'num_charged_residues',
-        'percent_charged_residues',
-        'num_apolar_residues',
-        'percent_apolar_residues',
-        'predicted_binding_affinity_kcal_mol',
-        'predicted_kd_M',
-        'kd_temperature_C'
-    ]
+    # The header and the single row are formatted directly and written in
+    # one call, with csv's default \r\n line endings
+    row = ','.join([format_csv_field(structure_id)] + [format_csv_field(metrics[key]) for key in CSV_METRICS])
     
-    with open(output_file, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        row = {
-            'structure_id': structure_id,
-            'buried_surface_area_A2': metrics['buried_surface_area'],
-            'num_interface_contacts': metrics['num_interface_contacts'],
-            'num_noninteracting_surface': metrics['num_noninteracting_surface'],
-            'num_charged_residues': metrics['num_charged_residues'],
-            'percent_charged_residues': metrics['percent_charged_residues'],
-            'num_apolar_residues': metrics['num_apolar_residues'],
-            'percent_apolar_residues': metrics['percent_apolar_residues'],
-            'predicted_binding_affinity_kcal_mol': metrics['predicted_binding_affinity'],
-            'predicted_kd_M': metrics['predicted_kd'],
-            'kd_temperature_C': metrics['kd_temperature']
-        }
-        
-        writer.writerow(row)
+    with open(output_file, 'wb') as csvfile:
+        csvfile.write(CSV_HEADER + row.encode() + b'\r\n')
 
 
 def main():